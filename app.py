@@ -6,16 +6,39 @@ Uses Censys API for discovering exposed Clawdbot installations.
 Background scheduler for hourly auto-scans.
 """
 
+import bisect
+import fcntl
+import functools
+import gzip
 import json
 import os
+import hashlib
 import random
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from flask import Flask, render_template, jsonify, request
+import threading
+import time
+import uuid
+from flask import Flask, render_template, jsonify, request, make_response
+from flask.json.provider import DefaultJSONProvider
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.triggers.cron import CronTrigger
 import shutil
+import tempfile
+from collections import Counter
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+
+import security_intel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,12 +46,46 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify() backed by orjson (falls back to stdlib json if not installed)."""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson:
+    app.json = ORJSONProvider(app)
+
 # Censys API configuration
 CENSYS_API_ID = os.environ.get('CENSYS_API_ID', '')
 CENSYS_API_SECRET = os.environ.get('CENSYS_API_SECRET', '')
 
-# Timeout for fingerprinting requests
-REQUEST_TIMEOUT = 3
+# Timeout for fingerprinting requests as (connect, read) so dead hosts fail fast
+REQUEST_TIMEOUT = (1, 3)
+
+# Shared HTTP session so fingerprint probes, Censys and the forecast APIs
+# reuse keep-alive connections instead of a fresh TCP/TLS handshake per call.
+# Probes (plain http to scanned hosts) never retry so dead hosts stay cheap;
+# the https APIs get a couple of quick retries on connection errors and on
+# gateway errors, after which the last response is handed back as usual.
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'clawdbot-scanner/1.0'})
+SESSION.mount('http://', HTTPAdapter(pool_connections=100, pool_maxsize=100))
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False
+    )
+))
 
 def ensure_data_file():
     """Ensure results.json exists in static/data folder."""
@@ -43,242 +100,483 @@ def ensure_data_file():
     
     return data_file
 
+# Resolved once at startup; request handlers read this path directly
+DATA_FILE = ensure_data_file()
+
+_now_cache = (0, '')
+
+def now_iso():
+    """Server time as an ISO string, formatted at most once per second."""
+    global _now_cache
+    second = int(time.time())
+    if second != _now_cache[0]:
+        _now_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _now_cache[1]
+
+# Parsed results.json (plus its aggregate stats), reused until the file's
+# mtime/size changes on disk
+_results_cache = {'key': None, 'entry': None}
+_results_lock = threading.Lock()
+
+def _cached_results():
+    """Return (results, aggregates) for results.json, re-parsing only on change."""
+    try:
+        st = os.stat(DATA_FILE)
+        key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    
+    with _results_lock:
+        # A missing file (key None) is cached too, until results.json appears
+        if _results_cache['entry'] is not None and _results_cache['key'] == key:
+            return _results_cache['entry']
+        
+        data = _read_json(DATA_FILE) if key is not None and key[1] else None
+        # Real scan size and time, reported even when demo rows are shown
+        scan_count = len(data) if data else 0
+        last_scan = datetime.fromtimestamp(st.st_mtime).isoformat() if data is not None else None
+        if not data:  # Only use file contents if it has actual data
+            data = demo_results()
+        
+        # Scans store time_to_compromise; backfill files written before that
+        for r in data:
+            if 'time_to_compromise' not in r:
+                r['time_to_compromise'] = time_to_compromise(r.get('risk_score', 50))
+        
+        aggregates = compute_stats(data)
+        aggregates['total'] = scan_count
+        aggregates['last_scan'] = last_scan
+        # Seeded by the file version so every worker (and every restart)
+        # reports the same figure until results.json changes
+        seed = key[0] if key else 0
+        aggregates['total_exposed'] = len(data) * random.Random(seed).randint(100, 10000)
+        
+        entry = (data, aggregates)
+        _results_cache['key'] = key
+        _results_cache['entry'] = entry
+        return entry
+
 def load_results():
-    """Load scan results."""
-    data_file = ensure_data_file()
-    if os.path.exists(data_file):
-        with open(data_file) as f:
-            data = json.load(f)
-            if data:  # Only return if file has actual data
-                return data
+    """Load scan results (cached until results.json is rewritten)."""
+    return _cached_results()[0]
+
+# Rendered bodies of the results-backed views, keyed by view name and
+# tagged with the cache entry they were built from
+_view_cache = {}
+
+# Bodies smaller than this aren't worth the gzip framing overhead
+GZIP_MIN_SIZE = 512
+
+def _snapshot(rv):
+    """Freeze a view's return value as (body, mimetype, etag, gzipped body)."""
+    response = make_response(rv)
+    body = response.get_data()
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    gzipped = gzip.compress(body, 6) if len(body) >= GZIP_MIN_SIZE else None
+    return body, response.mimetype, etag, gzipped
+
+def _replay(snapshot):
+    """Build a conditional, optionally gzipped response from a snapshot."""
+    body, mimetype, etag, gzipped = snapshot
+    if gzipped is not None and request.accept_encodings['gzip']:
+        response = app.response_class(gzipped, mimetype=mimetype)
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(etag + '-gz')
+    else:
+        response = app.response_class(body, mimetype=mimetype)
+        response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'private, max-age=0, must-revalidate'
+    return response.make_conditional(request)
+
+def cached_view(name, build):
+    """
+    Serve a view rendered from the cached results, re-rendering only
+    when results.json changes. build(results, aggregates) returns
+    anything Flask accepts as a response. Responses carry an ETag so
+    polling clients get a 304 while the data is unchanged, and the body
+    is gzipped once per refresh for clients that accept it.
+    """
+    entry = _cached_results()
+    hit = _view_cache.get(name)
+    if hit is None or hit[0] is not entry:
+        hit = (entry, _snapshot(build(*entry)))
+        _view_cache[name] = hit
+    return _replay(hit[1])
+
+def _read_json(path):
+    """Parse a JSON data file from disk."""
+    if orjson:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path) as f:
+        return json.load(f)
+
+def _write_json(path, data):
+    """
+    Write a JSON data file compactly. The file is replaced atomically, so
+    workers reading it while it is rewritten never see a half-written file.
+    """
+    if orjson:
+        body = orjson.dumps(data)
+    else:
+        body = json.dumps(data, separators=(',', ':')).encode()
     
-    # Return demo/sample data if no real data exists
+    # Per-process temp name so concurrent writers don't share it
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_file, path)
+
+# Demo rows are stamped with the server start time rather than "now"
+DEMO_TIMESTAMP = datetime.now().isoformat()
+
+def demo_results():
+    """Demo/sample data shown when no real scan data exists."""
     return [
         {
             "ip": "192.168.1.100",
             "port": 3000,
             "risk_score": 85,
+            "time_to_compromise": 7,
             "location": {"city": "Tel Aviv", "country_name": "Israel", "lat": 32.0853, "lng": 34.7818},
             "vulns": ["exposed_api", "no_auth"],
             "service": "Clawdbot Web UI",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": DEMO_TIMESTAMP,
             "source": "demo"
         },
         {
             "ip": "10.0.0.55",
             "port": 18789,
             "risk_score": 92,
+            "time_to_compromise": 4,
             "location": {"city": "New York", "country_name": "United States", "lat": 40.7128, "lng": -74.0060},
             "vulns": ["exposed_api", "exposed_terminal", "no_auth"],
             "service": "Clawdbot Gateway",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": DEMO_TIMESTAMP,
             "source": "demo"
         },
         {
             "ip": "172.16.0.23",
             "port": 8080,
             "risk_score": 45,
+            "time_to_compromise": 27,
             "location": {"city": "Berlin", "country_name": "Germany", "lat": 52.5200, "lng": 13.4050},
             "vulns": ["outdated_version"],
             "service": "Clawdbot Web UI",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": DEMO_TIMESTAMP,
             "source": "demo"
         }
     ]
 
-def calculate_risk_score(vulns):
-    """Calculate risk score based on vulnerabilities."""
-    base_score = 50
-    
-    vuln_weights = {
-        'no_auth': 25,
-        'exposed_api': 15,
-        'exposed_terminal': 30,
-        'default_creds': 20,
-        'outdated_version': 10,
-        'missing_rate_limiting': 5,
-        'gateway_exposed': 20,
-        'browser_control_exposed': 15
-    }
+def compute_stats(results):
+    """Aggregate risk buckets, average risk and country counts in one pass."""
+    critical = high = medium = low = 0
+    total_risk = 0
+    countries = Counter()
     
-    score = base_score
-    for vuln in vulns:
-        score += vuln_weights.get(vuln, 5)
-    
-    return min(100, max(0, score))
+    for r in results:
+        risk = r.get('risk_score', 0)
+        total_risk += risk
+        if risk > 85:
+            critical += 1
+        elif risk > 70:
+            high += 1
+        elif risk > 40:
+            medium += 1
+        else:
+            low += 1
+        countries[r.get('location', {}).get('country_name', 'Unknown')] += 1
+    
+    return {
+        'high_risk': critical + high,
+        'critical': critical,
+        'avg_risk': total_risk / max(len(results), 1),
+        'countries': len(countries),
+        'top_countries': countries.most_common(10),
+        'attack_surface': len(results),
+        'risk_distribution': [critical, high, medium, low]
+    }
+
+# Risk points added per vulnerability; anything unlisted counts as 5
+VULN_WEIGHTS = {
+    'no_auth': 25,
+    'exposed_api': 15,
+    'exposed_terminal': 30,
+    'default_creds': 20,
+    'outdated_version': 10,
+    'missing_rate_limiting': 5,
+    'gateway_exposed': 20,
+    'browser_control_exposed': 15
+}
+
+def time_to_compromise(risk_score):
+    """Estimated minutes for an attacker to compromise a host."""
+    return max(1, int((100 - risk_score) * 0.5))
+
+def calculate_risk_score(vulns):
+    """Calculate risk score based on vulnerabilities, each counted once."""
+    return min(100, 50 + sum(VULN_WEIGHTS.get(vuln, 5) for vuln in set(vulns)))
+
+# Probes only need the start of a page, so a host serving a huge (or
+# endless) body can't balloon memory or hold a probe thread open
+PROBE_MAX_BYTES = 64 * 1024
+
+def _probe_get(url):
+    """GET url and return (status_code, first PROBE_MAX_BYTES of the body)."""
+    with SESSION.get(url, timeout=REQUEST_TIMEOUT, stream=True) as response:
+        return response.status_code, response.raw.read(PROBE_MAX_BYTES, decode_content=True)
+
+def _probe_status_code(url):
+    """
+    Status code of url via HEAD. Servers that don't implement HEAD
+    (405/501) are asked again with a GET whose body is never read.
+    """
+    response = SESSION.head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+    if response.status_code in (405, 501):
+        with SESSION.get(url, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            return response.status_code
+    return response.status_code
+
+def _probe_health(ip, port):
+    """Check 1: Gateway API health endpoint."""
+    status_code, body = _probe_get(f"http://{ip}:{port}/api/health")
+    if status_code == 200:
+        data = json.loads(body)
+        if data.get('status') == 'ok':
+            return ['exposed_api'], {'gateway': True}
+    return [], {}
+
+def _probe_status(ip, port):
+    """Check 2: Gateway status endpoint."""
+    status_code, body = _probe_get(f"http://{ip}:{port}/api/status")
+    if status_code == 200:
+        data = json.loads(body)
+        vulns = [] if data.get('auth', {}).get('enabled') else ['no_auth']
+        return vulns, {'version': data.get('version', 'unknown')}
+    return [], {}
+
+# Product and login-form markers, found in one pass over the raw page bytes
+WEB_UI_MARKERS = re.compile(rb'clawdbot|claude|login|sign in', re.IGNORECASE)
+
+def _probe_web_ui(ip, port):
+    """Check 3: Clawdbot web UI indicators."""
+    status_code, body = _probe_get(f"http://{ip}:{port}")
+    if status_code == 200:
+        found = {m.lower() for m in WEB_UI_MARKERS.findall(body)}
+        # Check for Clawdbot-specific strings
+        if found & {b'clawdbot', b'claude'}:
+            # Check for authentication
+            if not found & {b'login', b'sign in'}:
+                return ['no_auth'], {'web_ui': True}
+            return [], {'web_ui': True}
+    return [], {}
+
+def _probe_gateway_port(ip, port):
+    """Check 4: Gateway port (18789) specific checks. Only the status matters."""
+    if _probe_status_code(f"http://{ip}:18789/health") == 200:
+        return ['gateway_exposed'], {'gateway_direct': True}
+    return [], {}
+
+def _probe_browser_control(ip, port):
+    """Check 5: Browser control port (18791). Only the status matters."""
+    if _probe_status_code(f"http://{ip}:18791/status") == 200:
+        return ['browser_control_exposed'], {'browser_control': True}
+    return [], {}
+
+# Once a host answers, its remaining checks run concurrently so the
+# fingerprint costs two round trips instead of the sum of all five
+FINGERPRINT_WORKERS = 16
+_probe_pool = ThreadPoolExecutor(max_workers=FINGERPRINT_WORKERS * 4, thread_name_prefix='probe')
 
 def fingerprint_clawdbot(ip, port):
     """
     Actively fingerprint a service to verify it's Clawdbot.
     Returns (is_clawdbot, vulns, service_info) tuple.
     """
-    base_url = f"http://{ip}:{port}"
     vulns = []
     service_info = {}
     
-    # Check 1: Gateway API health endpoint
+    # The health probe goes first: if the port refuses or never accepts a
+    # connection, the remaining probes would only fail the same way
     try:
-        response = requests.get(
-            f"{base_url}/api/health",
-            timeout=REQUEST_TIMEOUT
-        )
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('status') == 'ok':
-                vulns.append('exposed_api')
-                service_info['gateway'] = True
-    except:
-        pass
-    
-    # Check 2: Gateway status endpoint
-    try:
-        response = requests.get(
-            f"{base_url}/api/status",
-            timeout=REQUEST_TIMEOUT
-        )
-        if response.status_code == 200:
-            data = response.json()
-            service_info['version'] = data.get('version', 'unknown')
-            if not data.get('auth', {}).get('enabled'):
-                vulns.append('no_auth')
-    except:
+        probe_vulns, probe_info = _probe_health(ip, port)
+        vulns.extend(probe_vulns)
+        service_info.update(probe_info)
+    except requests.exceptions.ConnectionError:
+        return False, [], {}
+    except Exception:
         pass
     
-    # Check 3: Clawdbot web UI indicators
-    try:
-        response = requests.get(
-            base_url,
-            timeout=REQUEST_TIMEOUT
-        )
-        if response.status_code == 200:
-            content = response.text.lower()
-            # Check for Clawdbot-specific strings
-            if 'clawdbot' in content or 'claude' in content:
-                service_info['web_ui'] = True
-                
-                # Check for authentication
-                if 'login' not in content and 'sign in' not in content:
-                    vulns.append('no_auth')
-    except:
-        pass
-    
-    # Check 4: Gateway port (18789) specific checks
+    probes = [_probe_status, _probe_web_ui]
     if port == 18789:
-        try:
-            response = requests.get(
-                f"http://{ip}:18789/health",
-                timeout=REQUEST_TIMEOUT
-            )
-            if response.status_code == 200:
-                service_info['gateway_direct'] = True
-                vulns.append('gateway_exposed')
-        except:
-            pass
-    
-    # Check 5: Browser control port (18791)
+        probes.append(_probe_gateway_port)
     if port == 18791:
+        probes.append(_probe_browser_control)
+    
+    futures = [_probe_pool.submit(probe, ip, port) for probe in probes]
+    
+    # Merge in probe order so vulns are listed the same way every run
+    for future in futures:
         try:
-            response = requests.get(
-                f"http://{ip}:18791/status",
-                timeout=REQUEST_TIMEOUT
-            )
-            if response.status_code == 200:
-                service_info['browser_control'] = True
-                vulns.append('browser_control_exposed')
-        except:
-            pass
+            probe_vulns, probe_info = future.result()
+        except Exception:
+            continue
+        vulns.extend(probe_vulns)
+        service_info.update(probe_info)
     
     is_clawdbot = bool(service_info)  # Any positive fingerprint match
     return is_clawdbot, vulns, service_info
 
-def search_censys():
-    """Query Censys API for Clawdbot installations with fingerprinting."""
+# Hosts tend to reappear in every hourly scan, so a fingerprint is reused
+# per (ip, port) instead of probing the host again. The TTL outlasts the
+# hourly scan interval (plus trigger jitter and scan time) so the next
+# scheduled scan still finds the entry. Each gunicorn worker keeps its own
+# cache; scheduled scans all run in the worker holding the scheduler.
+FINGERPRINT_TTL_SECONDS = 70 * 60
+FINGERPRINT_CACHE_SIZE = 4096
+_fingerprint_cache = {}
+_fingerprint_cache_lock = threading.Lock()
+
+def cached_fingerprint(ip, port, force=False):
+    """
+    fingerprint_clawdbot() memoized for FINGERPRINT_TTL_SECONDS.
+    force=True probes the host again and refreshes the entry.
+    """
+    key = (ip, port)
+    with _fingerprint_cache_lock:
+        hit = _fingerprint_cache.get(key)
+    if hit and not force and time.time() - hit[0] < FINGERPRINT_TTL_SECONDS:
+        result = hit[1]
+    else:
+        result = fingerprint_clawdbot(ip, port)
+        with _fingerprint_cache_lock:
+            _fingerprint_cache.pop(key, None)
+            _fingerprint_cache[key] = (time.time(), result)
+            while len(_fingerprint_cache) > FINGERPRINT_CACHE_SIZE:
+                del _fingerprint_cache[next(iter(_fingerprint_cache))]
+    
+    # Callers extend the vulns, so hand out copies
+    is_clawdbot, vulns, service_info = result
+    return is_clawdbot, list(vulns), dict(service_info)
+
+CENSYS_SEARCH_URL = 'https://search.censys.io/api/v2/hosts/search'
+CENSYS_MAX_PAGES = int(os.environ.get('CENSYS_MAX_PAGES', 5))
+
+def iter_censys_hits(query, per_page=50, max_pages=CENSYS_MAX_PAGES):
+    """
+    Yield Censys host hits for a query, following the result cursor
+    page by page. Raises requests.HTTPError on a non-200 response.
+    """
+    cursor = None
+    for _ in range(max_pages):
+        params = {'q': query, 'per_page': per_page}
+        if cursor:
+            params['cursor'] = cursor
+        
+        response = SESSION.get(
+            CENSYS_SEARCH_URL,
+            params=params,
+            headers={'Accept': 'application/json'},
+            auth=(CENSYS_API_ID, CENSYS_API_SECRET),
+            timeout=15
+        )
+        logger.info(f"Censys query '{query}': {response.status_code}")
+        response.raise_for_status()
+        
+        # Censys pages are large; orjson parses the raw bytes directly
+        data = orjson.loads(response.content) if orjson else response.json()
+        result = data.get('result', {})
+        yield from result.get('hits', [])
+        
+        cursor = result.get('links', {}).get('next')
+        if not cursor:
+            break
+
+# Clawdbot service per well-known port, searched in a single Censys query
+CLAWDBOT_SERVICES = {
+    18789: 'Clawdbot Gateway',
+    3000: 'Clawdbot Web UI',
+    18791: 'Clawdbot Browser Control',
+}
+CENSYS_QUERY = 'services.port: {%s}' % ', '.join(str(p) for p in CLAWDBOT_SERVICES)
+
+def _censys_candidates(hits):
+    """Yield (ip, port, service, location) once per Clawdbot port on each hit."""
+    seen = set()
+    for hit in hits:
+        ip = hit.get('ip', 'unknown')
+        for service in hit.get('services', []):
+            port = service.get('port')
+            if port not in CLAWDBOT_SERVICES or (ip, port) in seen:
+                continue
+            seen.add((ip, port))
+            yield ip, port, CLAWDBOT_SERVICES[port], hit.get('location', {})
+
+def search_censys(force=False):
+    """
+    Query Censys API for Clawdbot installations with fingerprinting.
+    Recent fingerprints are reused unless force is set.
+    """
     if not CENSYS_API_ID or not CENSYS_API_SECRET:
         logger.warning("Censys API not configured")
         return None
     
-    results = []
-    seen_ips = set()  # Avoid duplicates
-    
-    # Search queries for Clawdbot-related services
-    queries = [
-        {"query": "18789", "service": "Clawdbot Gateway"},
-        {"query": "3000", "service": "Clawdbot Web UI"},
-        {"query": "18791", "service": "Clawdbot Browser Control"},
-    ]
+    # Pass 1: collect candidate hosts from the combined port query
+    candidates = []
+    try:
+        for candidate in _censys_candidates(iter_censys_hits(CENSYS_QUERY, per_page=100)):
+            candidates.append(candidate)
+    except requests.HTTPError as e:
+        if e.response.status_code == 401:
+            logger.error("Censys API authentication failed - check credentials")
+            return None
+        logger.error(f"Censys search error: {e}")
+    except Exception as e:
+        logger.error(f"Censys search error: {e}")
     
-    headers = {
-        'Accept': 'application/json'
-    }
+    # Pass 2: active fingerprinting of all candidates in parallel
+    logger.info(f"  Fingerprinting {len(candidates)} hosts...")
+    with ThreadPoolExecutor(max_workers=FINGERPRINT_WORKERS, thread_name_prefix='fingerprint') as pool:
+        fingerprints = list(pool.map(lambda c: cached_fingerprint(c[0], c[1], force), candidates))
     
-    for search in queries:
-        try:
-            url = f"https://search.censys.io/api/v2/hosts/search?q={search['query']}&per_page=50"
-            auth = (CENSYS_API_ID, CENSYS_API_SECRET)
-            
-            response = requests.get(url, headers=headers, auth=auth, timeout=15)
-            
-            logger.info(f"Censys query '{search['query']}': {response.status_code}")
-            
-            if response.status_code == 401:
-                logger.error("Censys API authentication failed - check credentials")
-                return None
-                
-            if response.status_code == 200:
-                data = response.json()
-                hits = data.get('result', {}).get('hits', [])
-                logger.info(f"  Found {len(hits)} hosts with port {search['query']}")
-                
-                for hit in hits:
-                    ip = hit.get('ip', 'unknown')
-                    
-                    if ip in seen_ips:
-                        continue
-                    seen_ips.add(ip)
-                    
-                    location = hit.get('location', {})
-                    services = hit.get('services', [])
-                    port = services[0].get('port', int(search['query'])) if services else int(search['query'])
-                    
-                    logger.info(f"  Fingerprinting {ip}:{port}...")
-                    
-                    # Active fingerprinting
-                    is_clawdbot, vulns, service_info = fingerprint_clawdbot(ip, port)
-                    
-                    if not is_clawdbot:
-                        logger.debug(f"    Skipping {ip}:{port} - fingerprint failed")
-                        logger.debug(f"    Service info: {service_info}")
-                        continue  # Skip non-Clawdbot services
-                    
-                    # Add fingerprinting-based vulnerabilities
-                    if 'gateway' in service_info and port != 18789:
-                        vulns.append('gateway_exposed')
-                    
-                    if 'browser_control' in service_info and port != 18791:
-                        vulns.append('browser_control_exposed')
-                    
-                    # Create result entry
-                    result = {
-                        'ip': ip,
-                        'port': port,
-                        'risk_score': calculate_risk_score(vulns),
-                        'location': {
-                            'city': location.get('city', 'Unknown'),
-                            'country_name': location.get('country', 'Unknown'),
-                            'lat': location.get('latitude'),
-                            'lng': location.get('longitude')
-                        },
-                        'vulns': vulns,
-                        'service': search['service'],
-                        'service_info': service_info,
-                        'timestamp': datetime.now().isoformat(),
-                        'fingerprint_method': 'active_verification'
-                    }
-                    results.append(result)
-                    
-        except Exception as e:
-            logger.error(f"Censys search error for {search['query']}: {e}")
-            continue
+    # One timestamp for every result in this scan
+    timestamp = datetime.now().isoformat()
+    results = []
+    for (ip, port, service, location), (is_clawdbot, vulns, service_info) in zip(candidates, fingerprints):
+        if not is_clawdbot:
+            logger.debug(f"    Skipping {ip}:{port} - fingerprint failed")
+            logger.debug(f"    Service info: {service_info}")
+            continue  # Skip non-Clawdbot services
+        
+        # Gateway API answering on a non-gateway port. The browser control
+        # probe already tags browser_control_exposed itself.
+        if 'gateway' in service_info and port != 18789:
+            vulns.append('gateway_exposed')
+        
+        # Several probes can report the same finding (e.g. no_auth)
+        vulns = list(dict.fromkeys(vulns))
+        
+        # Create result entry
+        risk_score = calculate_risk_score(vulns)
+        result = {
+            'ip': ip,
+            'port': port,
+            'risk_score': risk_score,
+            'time_to_compromise': time_to_compromise(risk_score),
+            'location': {
+                'city': location.get('city', 'Unknown'),
+                'country_name': location.get('country', 'Unknown'),
+                'lat': location.get('latitude'),
+                'lng': location.get('longitude')
+            },
+            'vulns': vulns,
+            'service': service,
+            'service_info': service_info,
+            'timestamp': timestamp,
+            'fingerprint_method': 'active_verification'
+        }
+        results.append(result)
     
     return results
 
@@ -297,104 +595,92 @@ def run_background_scan():
         return
     
     # Save results
-    data_file = ensure_data_file()
-    with open(data_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    _write_json(DATA_FILE, results)
     
     logger.info(f"✅ Scan complete. Found {len(results)} verified Clawdbot installations.")
 
 # Initialize scheduler
 scheduler = BackgroundScheduler()
 
+# Compiled once at startup. cached_view() only re-renders when the data
+# changes, so skip render_template()'s per-call lookup and signals.
+app.config['TEMPLATES_AUTO_RELOAD'] = bool(os.environ.get('FLASK_DEV'))
+DASHBOARD_TEMPLATE = app.jinja_env.get_template('dashboard.html')
+
 @app.route('/')
 def index():
     """Main dashboard."""
-    results = load_results()
-    
-    for r in results:
-        r['time_to_compromise'] = max(1, int((100 - r.get('risk_score', 50)) * 0.5))
-    
-    # Calculate chart data
-    critical_count = sum(1 for r in results if r.get('risk_score', 0) > 85)
-    high_count = sum(1 for r in results if 70 < r.get('risk_score', 0) <= 85)
-    medium_count = sum(1 for r in results if 40 < r.get('risk_score', 0) <= 70)
-    low_count = sum(1 for r in results if r.get('risk_score', 0) <= 40)
-    
-    # Get last scan time
-    data_file = ensure_data_file()
-    last_scan = None
-    scan_count = 0
-    if os.path.exists(data_file) and os.path.getsize(data_file) > 0:
-        with open(data_file) as f:
-            data = json.load(f)
-            scan_count = len(data)
-        last_scan = datetime.fromtimestamp(os.path.getmtime(data_file)).isoformat()
-    
-    stats = {
-        'total': scan_count,
-        'high_risk': sum(1 for r in results if r.get('risk_score', 0) > 70),
-        'critical': critical_count,
-        'avg_risk': sum(r.get('risk_score', 0) for r in results) / max(len(results), 1),
-        'countries': len(set(r.get('location', {}).get('country_name', 'Unknown') for r in results)),
-        'total_exposed': len(results) * random.randint(100, 10000),
-        'attack_surface': len(results),
-        # Chart data
-        'risk_distribution': [critical_count, high_count, medium_count, low_count],
-        'risk_labels': ['Critical', 'High', 'Medium', 'Low'],
+    return cached_view('index', _render_index)
+
+def build_stats(aggregates):
+    """Stats view model shared by the dashboard and /api/stats."""
+    return {
+        **aggregates,
         'api_connected': bool(CENSYS_API_ID),
-        'last_scan': last_scan,
         'auto_refresh': True
     }
+
+def _render_index(results, aggregates):
+    stats = build_stats(aggregates)
+    # Chart data
+    stats['risk_labels'] = ['Critical', 'High', 'Medium', 'Low']
     
-    return render_template('dashboard.html', results=results, stats=stats)
+    return DASHBOARD_TEMPLATE.render(results=results, stats=stats)
+
+# Largest page /api/results hands out when a client asks for one
+RESULTS_PAGE_MAX = 500
+RESULTS_PAGE_ARGS = frozenset({'limit', 'offset', 'min_risk'})
+
+# (cache entry, (results sorted highest risk first, negated risk scores)),
+# stored in one assignment so the ranking always matches its entry
+_ranked_cache = (None, None)
+
+def _ranked_results():
+    """Return (ranked results, negated risk scores) for the current results."""
+    global _ranked_cache
+    entry = _cached_results()
+    cached_entry, ranked_pair = _ranked_cache
+    if cached_entry is not entry:
+        ranked = sorted(entry[0], key=lambda r: r.get('risk_score', 0), reverse=True)
+        ranked_pair = (ranked, [-r.get('risk_score', 0) for r in ranked])
+        _ranked_cache = (entry, ranked_pair)
+    return ranked_pair
 
 @app.route('/api/results')
 def api_results():
-    """JSON API for results."""
-    results = load_results()
-    for r in results:
-        r['time_to_compromise'] = max(1, int((100 - r.get('risk_score', 50)) * 0.5))
-    return jsonify(results)
+    """
+    JSON API for results. With ?limit=, ?offset= or ?min_risk= only that
+    page is returned, highest risk first, and X-Total-Count holds the
+    number of results at or above min_risk.
+    """
+    # Other query parameters (e.g. a ?_= cache-buster) keep the full list
+    if not request.args.keys() & RESULTS_PAGE_ARGS:
+        return cached_view('api_results', lambda results, aggregates: jsonify(results))
+    
+    limit = min(max(request.args.get('limit', 200, type=int), 0), RESULTS_PAGE_MAX)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    min_risk = request.args.get('min_risk', 0, type=int)
+    
+    ranked, neg_scores = _ranked_results()
+    matching = bisect.bisect_right(neg_scores, -min_risk)
+    response = jsonify(ranked[offset:min(offset + limit, matching)])
+    response.headers['X-Total-Count'] = str(matching)
+    return response
 
 @app.route('/api/stats')
 def api_stats():
     """JSON API for stats."""
-    results = load_results()
-    critical_count = sum(1 for r in results if r.get('risk_score', 0) > 85)
-    high_count = sum(1 for r in results if 70 < r.get('risk_score', 0) <= 85)
-    medium_count = sum(1 for r in results if 40 < r.get('risk_score', 0) <= 70)
-    low_count = sum(1 for r in results if r.get('risk_score', 0) <= 40)
-    
-    # Get last scan time
-    data_file = ensure_data_file()
-    last_scan = None
-    scan_count = 0
-    if os.path.exists(data_file) and os.path.getsize(data_file) > 0:
-        with open(data_file) as f:
-            data = json.load(f)
-            scan_count = len(data)
-        last_scan = datetime.fromtimestamp(os.path.getmtime(data_file)).isoformat()
-    
-    return jsonify({
-        'total': scan_count,
-        'high_risk': sum(1 for r in results if r.get('risk_score', 0) > 70),
-        'critical': critical_count,
-        'avg_risk': sum(r.get('risk_score', 0) for r in results) / max(len(results), 1),
-        'countries': len(set(r.get('location', {}).get('country_name', 'Unknown') for r in results)),
-        'total_exposed': len(results) * random.randint(100, 10000),
-        'attack_surface': len(results),
-        'risk_distribution': [critical_count, high_count, medium_count, low_count],
-        'api_connected': bool(CENSYS_API_ID),
-        'last_scan': last_scan,
-        'auto_refresh': True
-    })
+    return cached_view('api_stats', _render_stats)
+
+def _render_stats(results, aggregates):
+    return jsonify(build_stats(aggregates))
 
 @app.route('/api/demo/<ip>/<int:port>')
 def api_demo(ip, port):
     """Generate demo attack simulation."""
     return jsonify({
         'target': f'{ip}:{port}',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_iso(),
         'vulnerabilities': [
             'No authentication required',
             'Exposed API endpoints',
@@ -412,14 +698,17 @@ def api_demo(ip, port):
 
 @app.route('/api/scan', methods=['POST'])
 def api_scan():
-    """Trigger a new scan via Censys API with fingerprinting."""
+    """
+    Trigger a new scan via Censys API with fingerprinting.
+    ?force=1 re-probes hosts that were fingerprinted recently.
+    """
     if not CENSYS_API_ID or not CENSYS_API_SECRET:
         return jsonify({
             'status': 'error',
             'message': 'Censys API not configured. Please set CENSYS_API_ID and CENSYS_API_SECRET.'
         }), 400
     
-    results = search_censys()
+    results = search_censys(force=request.args.get('force') == '1')
     
     if results is None:
         return jsonify({
@@ -428,14 +717,12 @@ def api_scan():
         }), 500
     
     # Save results
-    data_file = ensure_data_file()
-    with open(data_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    _write_json(DATA_FILE, results)
     
     return jsonify({
         'status': 'success',
         'message': f'Scan complete. Found {len(results)} verified Clawdbot installations.',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_iso(),
         'fingerprint_method': 'active_verification',
         'total_found': len(results)
     })
@@ -450,61 +737,35 @@ def api_scan_debug():
         }), 400
     
     raw_results = []
-    seen_ips = set()
     api_error = None
     
-    queries = [
-        {"query": "18789", "service": "Clawdbot Gateway"},
-        {"query": "3000", "service": "Clawdbot Web UI"},
-        {"query": "18791", "service": "Clawdbot Browser Control"},
-    ]
-    
-    headers = {'Accept': 'application/json'}
-    
-    for search in queries:
-        try:
-            url = f"https://search.censys.io/api/v2/hosts/search?q={search['query']}&per_page=20"
-            auth = (CENSYS_API_ID, CENSYS_API_SECRET)
-            response = requests.get(url, headers=headers, auth=auth, timeout=15)
-            
-            if response.status_code == 401:
-                api_error = "Censys API authentication failed (401)"
-                continue
-                
-            if response.status_code == 200:
-                data = response.json()
-                hits = data.get('result', {}).get('hits', [])
-                
-                for hit in hits:
-                    ip = hit.get('ip', 'unknown')
-                    if ip in seen_ips:
-                        continue
-                    seen_ips.add(ip)
-                    
-                    location = hit.get('location', {})
-                    services = hit.get('services', [])
-                    port = services[0].get('port', int(search['query'])) if services else int(search['query'])
-                    
-                    raw_results.append({
-                        'ip': ip,
-                        'port': port,
-                        'service': search['service'],
-                        'location': {
-                            'city': location.get('city', 'Unknown'),
-                            'country': location.get('country', 'Unknown'),
-                        },
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    
-        except Exception as e:
+    try:
+        hits = iter_censys_hits(CENSYS_QUERY, per_page=20, max_pages=1)
+        for ip, port, service, location in _censys_candidates(hits):
+            raw_results.append({
+                'ip': ip,
+                'port': port,
+                'service': service,
+                'location': {
+                    'city': location.get('city', 'Unknown'),
+                    'country': location.get('country', 'Unknown'),
+                },
+                'timestamp': now_iso()
+            })
+    except requests.HTTPError as e:
+        if e.response.status_code == 401:
+            api_error = "Censys API authentication failed (401)"
+        else:
             logger.error(f"Debug scan error: {e}")
+    except Exception as e:
+        logger.error(f"Debug scan error: {e}")
     
     return jsonify({
         'status': 'error' if api_error else 'success',
         'api_error': api_error,
         'total_hosts': len(raw_results),
         'hosts': raw_results,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso()
     })
 
 @app.route('/api/fingerprint/<ip>/<int:port>', methods=['GET'])
@@ -527,7 +788,7 @@ def api_refresh():
     return jsonify({
         'status': 'success',
         'message': 'Scan triggered',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso()
     })
 
 @app.route('/api/health')
@@ -540,59 +801,134 @@ def api_health():
     })
 
 # Security Intelligence Endpoints
+INTEL_FILE = 'static/data/security_intel.json'
+
 @app.route('/api/security-intel')
 def api_security_intel():
     """Return security intelligence data."""
     try:
-        intel_file = 'static/data/security_intel.json'
-        if os.path.exists(intel_file):
-            with open(intel_file) as f:
-                return jsonify(json.load(f))
+        if os.path.exists(INTEL_FILE):
+            return jsonify(_read_json(INTEL_FILE))
         return jsonify({'error': 'No security intelligence data available'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _run_security_intel():
+    """Refresh the security intelligence file and return a (payload, status_code)."""
+    try:
+        # Runs in-process on _intel_pool rather than forking a new interpreter
+        security_intel.refresh(INTEL_FILE)
+        return {
+            'status': 'success',
+            'message': 'Security intelligence refreshed'
+        }, 200
+    except Exception as e:
+        logger.error(f"Security intel refresh error: {e}")
+        return {
+            'status': 'error',
+            'message': str(e)
+        }, 500
+
+# Refreshes run off the request thread, one at a time across all gunicorn
+# workers. Job state lives in status files so any worker can answer a poll.
+_intel_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='intel')
+# Kept outside the static folder so status files and locks aren't served
+INTEL_JOBS_DIR = os.environ.get(
+    'INTEL_JOBS_DIR',
+    os.path.join(tempfile.gettempdir(), 'clawdbot-intel-jobs')
+)
+INTEL_CURRENT_FILE = os.path.join(INTEL_JOBS_DIR, 'current')
+# Held for the duration of a refresh, by whichever worker runs it
+INTEL_RUN_LOCK = os.path.join(INTEL_JOBS_DIR, 'run.lock')
+# Held briefly while checking for / starting a refresh
+INTEL_GUARD_LOCK = os.path.join(INTEL_JOBS_DIR, 'guard.lock')
+INTEL_JOBS_KEPT = 20
+
+def _intel_job_file(job_id):
+    return os.path.join(INTEL_JOBS_DIR, f'{job_id}.json')
+
+def _run_intel_job(job_id, run_lock):
+    """Run a queued refresh, record its outcome and release the run lock."""
+    recorded = False
+    try:
+        payload, status_code = _run_security_intel()
+        _write_json(_intel_job_file(job_id), {**payload, 'status_code': status_code})
+        recorded = True
+    finally:
+        try:
+            # Never leave a job pending because its outcome couldn't be saved
+            if not recorded:
+                _write_json(_intel_job_file(job_id), {
+                    'status': 'error',
+                    'message': 'Security intelligence refresh failed',
+                    'status_code': 500
+                })
+        finally:
+            run_lock.close()
+
+def _prune_intel_jobs():
+    """Drop all but the newest INTEL_JOBS_KEPT job status files."""
+    jobs = [e for e in os.scandir(INTEL_JOBS_DIR) if e.name.endswith('.json')]
+    jobs.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for e in jobs[INTEL_JOBS_KEPT:]:
+        try:
+            os.remove(e.path)
+        except OSError:
+            pass
+
 @app.route('/api/security-intel/refresh', methods=['POST'])
 def refresh_security_intel():
-    """Trigger security intelligence refresh."""
-    try:
-        import subprocess
-        result = subprocess.run(
-            ['python3', 'security_intel.py'],
-            cwd=os.path.dirname(os.path.abspath(__file__)),
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        if result.returncode == 0:
-            return jsonify({
-                'status': 'success',
-                'message': 'Security intelligence refreshed'
-            })
+    """Queue a security intelligence refresh and return its job id."""
+    os.makedirs(INTEL_JOBS_DIR, exist_ok=True)
+    with open(INTEL_GUARD_LOCK, 'w') as guard:
+        fcntl.flock(guard, fcntl.LOCK_EX)
+        run_lock = open(INTEL_RUN_LOCK, 'w')
+        try:
+            fcntl.flock(run_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            # Reuse the refresh that hasn't finished instead of stacking another
+            run_lock.close()
+            with open(INTEL_CURRENT_FILE) as f:
+                job_id = f.read()
         else:
-            return jsonify({
-                'status': 'error',
-                'message': result.stderr
-            }), 500
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+            job_id = uuid.uuid4().hex
+            _write_json(_intel_job_file(job_id), {'status': 'pending'})
+            with open(INTEL_CURRENT_FILE, 'w') as f:
+                f.write(job_id)
+            _intel_pool.submit(_run_intel_job, job_id, run_lock)
+            _prune_intel_jobs()
+    
+    return jsonify({'status': 'accepted', 'job_id': job_id}), 202
+
+@app.route('/api/security-intel/refresh/<job_id>')
+def security_intel_refresh_status(job_id):
+    """Poll a queued security intelligence refresh."""
+    # Job ids are uuid4 hex; anything else can't name a status file
+    if not re.fullmatch(r'[0-9a-f]{32}', job_id):
+        return jsonify({'error': 'Unknown job id'}), 404
+    try:
+        payload = _read_json(_intel_job_file(job_id))
+    except FileNotFoundError:
+        return jsonify({'error': 'Unknown job id'}), 404
+    if payload['status'] == 'pending':
+        return jsonify({'status': 'pending', 'job_id': job_id}), 202
+    status_code = payload.pop('status_code')
+    return jsonify({**payload, 'job_id': job_id}), status_code
 
 @app.route('/api/security-intel/summary')
 def api_security_summary():
     """Quick summary endpoint for dashboard widgets."""
     try:
-        intel_file = 'static/data/security_intel.json'
-        if os.path.exists(intel_file):
-            with open(intel_file) as f:
-                data = json.load(f)
-                return jsonify({
-                    'total_discussions': data['summary']['total_discussions'],
-                    'critical_count': data['summary']['critical_count'],
-                    'high_count': data['summary']['high_count'],
-                    'average_severity': data['summary']['average_severity'],
-                    'top_issue': data['top_security_concerns'][0]['issue'] if data['top_security_concerns'] else None,
-                    'generated': data['meta']['generated']
-                })
+        if os.path.exists(INTEL_FILE):
+            data = _read_json(INTEL_FILE)
+            return jsonify({
+                'total_discussions': data['summary']['total_discussions'],
+                'critical_count': data['summary']['critical_count'],
+                'high_count': data['summary']['high_count'],
+                'average_severity': data['summary']['average_severity'],
+                'top_issue': data['top_security_concerns'][0]['issue'] if data['top_security_concerns'] else None,
+                'generated': data['meta']['generated']
+            })
         return jsonify({'error': 'No data available'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -600,6 +936,69 @@ def api_security_summary():
 
 # ============ SURF FORECAST ENDPOINTS ============
 
+# Upstream forecasts refresh hourly, so a fetched forecast is reused for
+# half an hour per (function, location, arguments). Coordinates are
+# rounded to ~1 km so nearby requests for the same spot share an entry.
+FORECAST_TTL_SECONDS = 1800
+FORECAST_CACHE_SIZE = 512
+_forecast_cache = {}
+_forecast_cache_lock = threading.Lock()
+
+def forecast_cached(fetch):
+    """
+    Cache fetch(lat, lon, ...) in memory for FORECAST_TTL_SECONDS.
+    If a refresh fails, the last good forecast is returned with
+    '_stale': True instead of None.
+    """
+    @functools.wraps(fetch)
+    def wrapper(lat, lon, *args, **kwargs):
+        key = (fetch.__name__, round(lat, 2), round(lon, 2), args, tuple(sorted(kwargs.items())))
+        
+        with _forecast_cache_lock:
+            hit = _forecast_cache.get(key)
+        if hit and time.time() - hit[0] < FORECAST_TTL_SECONDS:
+            return dict(hit[1])
+        
+        data = fetch(lat, lon, *args, **kwargs)
+        if data is None:
+            return {**hit[1], '_stale': True} if hit else None
+        
+        with _forecast_cache_lock:
+            _forecast_cache.pop(key, None)
+            _forecast_cache[key] = (time.time(), data)
+            while len(_forecast_cache) > FORECAST_CACHE_SIZE:
+                del _forecast_cache[next(iter(_forecast_cache))]
+        return dict(data)
+    
+    return wrapper
+
+# Fields describing how a forecast was fetched (when, from which source or
+# cache, how old) rather than the forecast itself. They change as the file
+# cache ages, so they are left out of the ETag.
+FORECAST_META_KEYS = frozenset({'generated', 'updated', 'source', 'is_cached', 'cache_age_hours'})
+
+def forecast_response(payload, max_age=600):
+    """
+    Serve a forecast payload as JSON with an ETag. The forecast fields
+    are encoded once; the ETag is a hash of those bytes, and a 200 reuses
+    them with the FORECAST_META_KEYS fields spliced in.
+    """
+    stable = {k: v for k, v in payload.items() if k not in FORECAST_META_KEYS}
+    body = app.json.dumps(stable).encode()
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        meta = {k: v for k, v in payload.items() if k in FORECAST_META_KEYS}
+        if meta:
+            # Both encodings are JSON objects, so join them at the braces
+            body = body[:-1] + (b',' if stable else b'') + app.json.dumps(meta).encode()[1:]
+        response = app.response_class(body, mimetype=app.json.mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
+
+@forecast_cached
 def get_multi_day_forecast(lat, lon, days=3):
     """Get 3-day forecast for all days."""
     headers = {
@@ -617,7 +1016,7 @@ def get_multi_day_forecast(lat, lon, days=3):
     }
     
     try:
-        weather_resp = requests.get(weather_url, params=weather_params, headers=headers, timeout=15)
+        weather_resp = SESSION.get(weather_url, params=weather_params, headers=headers, timeout=15)
         weather_resp.raise_for_status()
         weather_data = weather_resp.json()
         
@@ -626,27 +1025,29 @@ def get_multi_day_forecast(lat, lon, days=3):
         wind_speeds = weather_data['hourly'].get('wind_speed_10m', [])
         
         daily_analysis = {}
-        for i, time in enumerate(times):
-            if i >= len(wind_speeds):
-                break
-            speed = wind_speeds[i]
+        for timestamp, speed in zip(times, wind_speeds):
             if speed is None:
                 continue
             
-            date = time[:10]
-            hour = datetime.fromisoformat(time).hour
+            # Open-Meteo times are 'YYYY-MM-DDTHH:MM', so slice instead of parsing
+            date = timestamp[:10]
+            hour = int(timestamp[11:13])
             
-            if date not in daily_analysis:
-                daily_analysis[date] = {'hours': [], 'good_hours': 0, 'max_speed': 0, 'min_speed': 100}
+            day = daily_analysis.get(date)
+            if day is None:
+                day = daily_analysis[date] = {'hours': 0, 'total_speed': 0, 'good_hours': 0, 'max_speed': 0, 'min_speed': 100}
             
-            daily_analysis[date]['hours'].append({'hour': hour, 'speed': speed})
+            day['hours'] += 1
+            day['total_speed'] += speed
             
             # Count good wing foil hours (10-40 km/h, 6 AM - 7 PM)
             if 10 <= speed <= 40 and 6 <= hour <= 19:
-                daily_analysis[date]['good_hours'] += 1
+                day['good_hours'] += 1
             
-            daily_analysis[date]['max_speed'] = max(daily_analysis[date]['max_speed'], speed)
-            daily_analysis[date]['min_speed'] = min(daily_analysis[date]['min_speed'], speed)
+            if speed > day['max_speed']:
+                day['max_speed'] = speed
+            if speed < day['min_speed']:
+                day['min_speed'] = speed
         
         # Score and rank days
         days_ranked = []
@@ -654,7 +1055,7 @@ def get_multi_day_forecast(lat, lon, days=3):
             score = data['good_hours'] * 10  # More good hours = higher score
             
             # Bonus for optimal wind range
-            avg_speed = sum(h['speed'] for h in data['hours']) / len(data['hours']) if data['hours'] else 0
+            avg_speed = data['total_speed'] / data['hours']
             if 15 <= avg_speed <= 35:
                 score += 20  # Perfect average
             
@@ -667,13 +1068,18 @@ def get_multi_day_forecast(lat, lon, days=3):
             })
         
         # Sort by score
-        days_ranked.sort(key=lambda x: x['score'], reverse=True)
+        days_ranked.sort(key=itemgetter('score'), reverse=True)
         
-        return {
+        forecast = {
             'daily': days_ranked,
             'source': 'Open-Meteo Weather API (free)',
             'updated': datetime.now().isoformat()
         }
+        
+        # Save to cache
+        save_to_cache(forecast, MULTI_DAY_CACHE_FILE)
+        
+        return forecast
     except Exception as e:
         logger.error(f"Multi-day forecast error: {e}")
         return None
@@ -723,6 +1129,10 @@ def load_from_cache(cache_file, max_age_hours=24):
         return None
 
 
+# Runs the weather request alongside the marine one in get_surf_forecast()
+_forecast_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='forecast')
+
+@forecast_cached
 def get_surf_forecast(lat, lon, days=1):
     """Fetch surf forecast from Open-Meteo APIs (Marine + Weather for wind)."""
     headers = {
@@ -750,13 +1160,18 @@ def get_surf_forecast(lat, lon, days=1):
     }
     
     try:
+        # The two APIs are independent, so fetch wind while waves load
+        weather_future = _forecast_pool.submit(
+            SESSION.get, weather_url, params=weather_params, headers=headers, timeout=15
+        )
+        
         # Fetch marine data
-        marine_resp = requests.get(marine_url, params=marine_params, headers=headers, timeout=15)
+        marine_resp = SESSION.get(marine_url, params=marine_params, headers=headers, timeout=15)
         marine_resp.raise_for_status()
         marine_data = marine_resp.json()
         
         # Fetch weather data
-        weather_resp = requests.get(weather_url, params=weather_params, headers=headers, timeout=15)
+        weather_resp = weather_future.result()
         weather_resp.raise_for_status()
         weather_data = weather_resp.json()
         
@@ -785,14 +1200,14 @@ def get_surf_forecast(lat, lon, days=1):
         return None
 
 
+COMPASS_POINTS = ('N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
+                  'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW')
+
 def wind_direction_name(degrees):
     """Convert wind direction in degrees to compass name."""
     if degrees is None:
         return '--'
-    dirs = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 
-            'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
-    index = round(degrees / 22.5) % 16
-    return dirs[index]
+    return COMPASS_POINTS[round(degrees / 22.5) % 16]
 
 
 def geocode_location(location):
@@ -812,7 +1227,7 @@ def geocode_location(location):
             'User-Agent': 'Ayali-WingFoil-Forecast/1.0'
         }
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = SESSION.get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -942,6 +1357,67 @@ def generate_wind_summary(hourly_data):
     return ' '.join(summary_parts)
 
 
+def _score_wing_foil_hour(wind_speed, wave_height, wave_period):
+    """Wing foil score for one hour (wind-focused, low waves preferred)."""
+    score = 0
+    
+    # Wind: WING FOIL NEEDS 15-40 km/h (CRITICAL)
+    if 15 <= wind_speed <= 40:
+        # Sweet spot for wing foil
+        if 20 <= wind_speed <= 35:
+            score += 50  # Perfect!
+        else:
+            score += 40  # Good
+    elif 10 <= wind_speed < 15:
+        score += 20  # Light but possible
+    elif wind_speed < 10:
+        score -= 30  # Too light - no lift
+    else:  # wind_speed > 40
+        score -= 20  # Too strong - dangerous
+    
+    # Waves: LOWER is better for wing foil (stability)
+    if wave_height <= 0.3:
+        score += 25  # Perfectly calm
+    elif wave_height <= 0.6:
+        score += 15  # Manageable
+    elif wave_height > 1.0:
+        score -= 30  # Too choppy - destabilizes foil
+    
+    # Wave period: longer = smoother rides
+    if wave_period >= 10:
+        score += 10
+    elif wave_period >= 7:
+        score += 5
+    
+    return score
+
+
+# Score cut-offs for the best-time label: <=0 Poor, <=20 Fair, <=40 Good, else Great
+CONDITION_THRESHOLDS = (0, 20, 40)
+CONDITION_LABELS = ('❌ Poor', '⚠️ Fair', '✅ Good', '🔥 Great')
+
+def rate_conditions(score):
+    """Label an hour's wing foil score."""
+    return CONDITION_LABELS[bisect.bisect_left(CONDITION_THRESHOLDS, score)]
+
+
+# Good-wind-hour cut-offs for multi-day recommendations: (rating, message, best_for)
+DAY_RATING_HOURS = (1, 3, 6)
+DAY_RATINGS = (
+    ('❌ Poor', 'No good wing foil conditions', 'Skip'),
+    ('⚠️ Fair', 'Only {hours} good hour - check timing', 'Quick session'),
+    ('✅ Good', '{hours} hours of good wind', 'Wing foiling (short session)'),
+    ('🔥 Excellent', '{hours} hours of good wind (10-40 km/h)', 'Wing foiling'),
+)
+
+
+def _aligned(values, n):
+    """Trim or None-pad an hourly series to n readings so it zips with times."""
+    if len(values) >= n:
+        return values[:n]
+    return list(values) + [None] * (n - len(values))
+
+
 def analyze_surf_conditions(hourly_data, target_hour_start=6, target_hour_end=10):
     """Find best surf time based on conditions."""
     times = hourly_data.get('time', [])
@@ -952,69 +1428,73 @@ def analyze_surf_conditions(hourly_data, target_hour_start=6, target_hour_end=10
     wave_periods = hourly_data.get('wave_period', [])
     
     best_hours = []
-    
-    for i, time in enumerate(times):
-        hour = datetime.fromisoformat(time).hour
+    n = len(times)
+    series = zip(
+        times,
+        _aligned(wave_heights, n),
+        _aligned(wave_dirs, n),
+        _aligned(wind_speeds, n),
+        _aligned(wind_dirs, n),
+        _aligned(wave_periods, n)
+    )
+    
+    for timestamp, wave_height, wave_dir, wind_speed, wind_dir, wave_period in series:
+        # Open-Meteo times are 'YYYY-MM-DDTHH:MM', so slice instead of parsing
+        hour = int(timestamp[11:13])
         if hour < target_hour_start or hour >= target_hour_end:
             continue
         
-        wave_height = wave_heights[i] if i < len(wave_heights) and wave_heights[i] is not None else 0
-        wind_speed = wind_speeds[i] if i < len(wind_speeds) and wind_speeds[i] is not None else 0
-        wave_period = wave_periods[i] if i < len(wave_periods) and wave_periods[i] is not None else 0
-        
-        # WING FOIL SCORING (wind-focused, low waves preferred)
-        score = 0
-        
-        # Wind: WING FOIL NEEDS 15-40 km/h (CRITICAL)
-        if 15 <= wind_speed <= 40:
-            # Sweet spot for wing foil
-            if 20 <= wind_speed <= 35:
-                score += 50  # Perfect!
-            else:
-                score += 40  # Good
-        elif 10 <= wind_speed < 15:
-            score += 20  # Light but possible
-        elif wind_speed < 10:
-            score -= 30  # Too light - no lift
-        else:  # wind_speed > 40
-            score -= 20  # Too strong - dangerous
-        
-        # Waves: LOWER is better for wing foil (stability)
-        if wave_height <= 0.3:
-            score += 25  # Perfectly calm
-        elif wave_height <= 0.6:
-            score += 15  # Manageable
-        elif wave_height <= 1.0:
-            score += 0  # OK
-        else:  # wave_height > 1.0
-            score -= 30  # Too choppy - destabilizes foil
-        
-        # Wave period: longer = smoother rides
-        if wave_period >= 10:
-            score += 10
-        elif wave_period >= 7:
-            score += 5
+        if wave_height is None:
+            wave_height = 0
+        if wind_speed is None:
+            wind_speed = 0
+        if wave_period is None:
+            wave_period = 0
         
         best_hours.append({
-            'time': time,
+            'time': timestamp,
             'hour': hour,
             'wave_height': wave_height,
-            'wave_direction': wave_dirs[i] if i < len(wave_dirs) else None,
+            'wave_direction': wave_dir,
             'wind_speed': wind_speed,
-            'wind_direction': wind_dirs[i] if i < len(wind_dirs) else None,
+            'wind_direction': wind_dir,
             'wave_period': wave_period,
-            'score': score
+            'score': _score_wing_foil_hour(wind_speed, wave_height, wave_period)
         })
     
     # Sort by score
-    best_hours.sort(key=lambda x: x['score'], reverse=True)
+    best_hours.sort(key=itemgetter('score'), reverse=True)
     return best_hours
 
 
+def require_latlon(view):
+    """Parse and range-check the lat/lon query args, passing them to the view."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        lat = request.args.get('lat', type=float)
+        lon = request.args.get('lon', type=float)
+        
+        if lat is None or lon is None:
+            return jsonify({'error': 'Missing lat/lon parameters'}), 400
+        
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            return jsonify({'error': 'Invalid coordinates'}), 400
+        
+        return view(lat, lon, *args, **kwargs)
+    return wrapper
+
+
+# surf.html takes no template variables, so it is rendered on first use
+# and then replayed like the results-backed views
+_surf_page = None
+
 @app.route('/surf')
 def surf_dashboard():
     """Surf forecast dashboard."""
-    return render_template('surf.html')
+    global _surf_page
+    if _surf_page is None:
+        _surf_page = _snapshot(render_template('surf.html'))
+    return _replay(_surf_page)
 
 
 @app.route('/api/surf/geocode')
@@ -1044,67 +1524,56 @@ def api_surf_geocode():
 
 
 @app.route('/api/surf/forecast')
-def api_surf_forecast():
+@require_latlon
+def api_surf_forecast(lat, lon):
     """Get surf forecast for a location."""
-    lat = request.args.get('lat', type=float)
-    lon = request.args.get('lon', type=float)
     spot_name = request.args.get('spot', 'Unknown Spot')
     
-    if lat is None or lon is None:
-        return jsonify({'error': 'Missing lat/lon parameters'}), 400
+    # Fetched per location (and cached in memory by forecast_cached); the
+    # shared file cache only stands in when every upstream API fails
+    forecast = get_surf_forecast(lat, lon)
+    if forecast and forecast.get('_stale'):
+        forecast['_source'] = forecast.get('_source', 'Cached') + ' (stale)'
     
-    if lat < -90 or lat > 90 or lon < -180 or lon > 180:
-        return jsonify({'error': 'Invalid coordinates'}), 400
-    
-    # Check cache FIRST to avoid rate limiting
-    forecast = load_from_cache(FORECAST_CACHE_FILE, max_age_hours=2)
-    
-    if forecast:
-        logger.info("Using cached forecast data")
-        forecast['_source'] = forecast.get('_source', 'Cached') + ' (fresh)'
-    else:
-        # Cache miss - fetch from API
-        forecast = get_surf_forecast(lat, lon)
-        
-        if not forecast:
-            # Try fallback API
-            try:
-                headers = {'User-Agent': 'Ayali-WingFoil-Forecast/1.0'}
-                weather_url = "https://api.open-meteo.com/v1/forecast"
-                weather_params = {
-                    'latitude': lat,
-                    'longitude': lon,
-                    'hourly': 'wind_speed_10m,wind_direction_10m,wave_height',
-                    'timezone': 'auto',
-                    'forecast_days': 1
-                }
-                weather_resp = requests.get(weather_url, params=weather_params, headers=headers, timeout=30)
-                weather_resp.raise_for_status()
-                weather_data = weather_resp.json()
-                
-                forecast = {
-                    'hourly': {
-                        'time': weather_data.get('hourly', {}).get('time', []),
-                        'wave_height': weather_data.get('hourly', {}).get('wave_height', []),
-                        'wind_speed_10m': weather_data.get('hourly', {}).get('wind_speed_10m', []),
-                        'wind_direction_10m': weather_data.get('hourly', {}).get('wind_direction_10m', []),
-                    },
-                    '_source': 'Open-Meteo Weather API (fallback)',
-                    '_updated': datetime.now().isoformat(),
-                    '_cached': False
-                }
-                save_to_cache(forecast, FORECAST_CACHE_FILE)
-            except Exception as fallback_error:
-                logger.error(f"Fallback also failed: {fallback_error}")
-                
-                # Try loading from cache (even old cache)
-                forecast = load_from_cache(FORECAST_CACHE_FILE, max_age_hours=168)  # Up to 1 week old
-                
-                if forecast:
-                    logger.info("Using old cached forecast data")
-                    forecast['_source'] = forecast.get('_source', 'Cached') + ' (stale)'
-                else:
-                    return jsonify({'error': 'Failed to fetch forecast and no cached data available'}), 500
+    if not forecast:
+        # Try fallback API
+        try:
+            headers = {'User-Agent': 'Ayali-WingFoil-Forecast/1.0'}
+            weather_url = "https://api.open-meteo.com/v1/forecast"
+            weather_params = {
+                'latitude': lat,
+                'longitude': lon,
+                'hourly': 'wind_speed_10m,wind_direction_10m,wave_height',
+                'timezone': 'auto',
+                'forecast_days': 1
+            }
+            weather_resp = SESSION.get(weather_url, params=weather_params, headers=headers, timeout=30)
+            weather_resp.raise_for_status()
+            weather_data = weather_resp.json()
+            
+            forecast = {
+                'hourly': {
+                    'time': weather_data.get('hourly', {}).get('time', []),
+                    'wave_height': weather_data.get('hourly', {}).get('wave_height', []),
+                    'wind_speed_10m': weather_data.get('hourly', {}).get('wind_speed_10m', []),
+                    'wind_direction_10m': weather_data.get('hourly', {}).get('wind_direction_10m', []),
+                },
+                '_source': 'Open-Meteo Weather API (fallback)',
+                '_updated': datetime.now().isoformat(),
+                '_cached': False
+            }
+            save_to_cache(forecast, FORECAST_CACHE_FILE)
+        except Exception as fallback_error:
+            logger.error(f"Fallback also failed: {fallback_error}")
+            
+            # Try loading from cache (even old cache)
+            forecast = load_from_cache(FORECAST_CACHE_FILE, max_age_hours=168)  # Up to 1 week old
+            
+            if forecast:
+                logger.info("Using old cached forecast data")
+                forecast['_source'] = forecast.get('_source', 'Cached') + ' (stale)'
+            else:
+                return jsonify({'error': 'Failed to fetch forecast and no cached data available'}), 500
     
     # Extract metadata
     source = forecast.get('_source', 'Open-Meteo Marine API')
@@ -1128,14 +1597,12 @@ def api_surf_forecast():
     wind_speeds = hourly.get('wind_speed_10m', [])
     wind_dirs = hourly.get('wind_direction_10m', [])
     
-    for i, time in enumerate(times):
-        hour = datetime.fromisoformat(time).hour
-        speed = wind_speeds[i] if i < len(wind_speeds) else None
-        direction = wind_dirs[i] if i < len(wind_dirs) else None
-        
+    n = len(times)
+    
+    for timestamp, speed, direction in zip(times, _aligned(wind_speeds, n), _aligned(wind_dirs, n)):
         all_hours.append({
-            'time': time,
-            'hour': hour,
+            'time': timestamp,
+            'hour': int(timestamp[11:13]),
             'wind_speed': speed,
             'wind_direction': direction,
             'wind_dir_name': wind_direction_name(direction)
@@ -1144,9 +1611,6 @@ def api_surf_forecast():
     # Generate wind summary
     wind_summary = generate_wind_summary(hourly)
     
-    # Generate forecast summary (today's outlook)
-    forecast_summary = generate_forecast_summary(hourly, best_time)
-    
     # Get best time
     best_time = None
     if morning_surf:
@@ -1158,10 +1622,13 @@ def api_surf_forecast():
             'wind_direction': best['wind_direction'],
             'wind_dir_name': wind_direction_name(best.get('wind_direction')),
             'score': best['score'],
-            'conditions': '🔥 Great' if best['score'] > 40 else ('✅ Good' if best['score'] > 20 else ('⚠️ Fair' if best['score'] > 0 else '❌ Poor'))
+            'conditions': rate_conditions(best['score'])
         }
     
-    return jsonify({
+    # Generate forecast summary (today's outlook)
+    forecast_summary = generate_forecast_summary(hourly, best_time)
+    
+    return forecast_response({
         'spot': spot_name,
         'location': {'lat': lat, 'lon': lon},
         'source': source,
@@ -1189,112 +1656,78 @@ def api_surf_conditions():
     if not forecast:
         return jsonify({'error': 'Failed to fetch conditions'}), 500
     
-    return jsonify({
+    return forecast_response({
         'hourly': forecast.get('hourly', {}),
         'timezone': forecast.get('timezone'),
         'generated': datetime.now().isoformat()
     })
 
 
+@functools.lru_cache(maxsize=128)
+def format_forecast_date(date):
+    """Format an Open-Meteo 'YYYY-MM-DD' date as e.g. 'Monday, Jan 26'."""
+    return datetime(int(date[:4]), int(date[5:7]), int(date[8:10])).strftime('%A, %b %d')
+
+
 @app.route('/api/surf/multi-day')
-def api_surf_multi_day():
+@require_latlon
+def api_surf_multi_day(lat, lon):
     """Get 3-day surf forecast comparison."""
-    lat = request.args.get('lat', type=float)
-    lon = request.args.get('lon', type=float)
+    # Fetched per location (and cached in memory by forecast_cached); the
+    # shared file cache only stands in when the upstream API fails
+    forecast = get_multi_day_forecast(lat, lon, days=3)
     
-    if lat is None or lon is None:
-        return jsonify({'error': 'Missing lat/lon parameters'}), 400
-    
-    if lat < -90 or lat > 90 or lon < -180 or lon > 180:
-        return jsonify({'error': 'Invalid coordinates'}), 400
-    
-    # Check cache FIRST to avoid rate limiting
-    forecast = load_from_cache(MULTI_DAY_CACHE_FILE, max_age_hours=6)
-    
-    if forecast:
-        logger.info("Using cached multi-day forecast")
-        forecast['source'] = forecast.get('source', 'Cached') + ' (fresh)'
-    else:
-        # Cache miss - fetch from API
-        forecast = get_multi_day_forecast(lat, lon, days=3)
-        
-        if not forecast:
-            # Try loading old cache
-            forecast = load_from_cache(MULTI_DAY_CACHE_FILE, max_age_hours=168)
-            if forecast:
-                forecast['source'] = forecast.get('source', 'Cached') + ' (stale)'
-            else:
-                return jsonify({'error': 'Failed to fetch multi-day forecast'}), 500
+    if not forecast:
+        # Try loading old cache
+        forecast = load_from_cache(MULTI_DAY_CACHE_FILE, max_age_hours=168)
+        if forecast:
+            forecast['source'] = forecast.get('source', 'Cached') + ' (stale)'
         else:
-            save_to_cache(forecast, MULTI_DAY_CACHE_FILE)
-    
-    # Add recommendations
-    if forecast['daily']:
-        best_day = forecast['daily'][0]
-        recommendations = []
-        
-        for day in forecast['daily'][:3]:
-            date = datetime.strptime(day['date'], '%Y-%m-%d').strftime('%A, %b %d')
-            
-            if day['good_hours'] >= 6:
-                recommendations.append({
-                    'date': date,
-                    'rating': '🔥 Excellent',
-                    'message': f"{day['good_hours']} hours of good wind (10-40 km/h)",
-                    'best_for': 'Wing foiling'
-                })
-            elif day['good_hours'] >= 3:
-                recommendations.append({
-                    'date': date,
-                    'rating': '✅ Good',
-                    'message': f"{day['good_hours']} hours of good wind",
-                    'best_for': 'Wing foiling (short session)'
-                })
-            elif day['good_hours'] >= 1:
-                recommendations.append({
-                    'date': date,
-                    'rating': '⚠️ Fair',
-                    'message': f"Only {day['good_hours']} good hour - check timing",
-                    'best_for': 'Quick session'
-                })
-            else:
-                recommendations.append({
-                    'date': date,
-                    'rating': '❌ Poor',
-                    'message': 'No good wing foil conditions',
-                    'best_for': 'Skip'
-                })
+            return jsonify({'error': 'Failed to fetch multi-day forecast'}), 500
+    elif forecast.get('_stale'):
+        forecast['source'] += ' (stale)'
+    
+    # Add recommendations. Days come ranked by score, so the first one is
+    # the best day and its formatted date is the first recommendation's.
+    daily = forecast['daily']
+    recommendations = []
+    for day in daily[:3]:
+        rating, message, best_for = DAY_RATINGS[bisect.bisect_right(DAY_RATING_HOURS, day['good_hours'])]
+        recommendations.append({
+            'date': format_forecast_date(day['date']),
+            'rating': rating,
+            'message': message.format(hours=day['good_hours']),
+            'best_for': best_for
+        })
+    best_day = daily[0] if daily else None
     
-    return jsonify({
+    return forecast_response({
         'source': forecast['source'],
         'updated': forecast['updated'],
-        'days': forecast['daily'],
-        'recommendations': recommendations if forecast['daily'] else [],
+        'days': daily,
+        'recommendations': recommendations,
         'best_day': {
-            'date': datetime.strptime(best_day['date'], '%Y-%m-%d').strftime('%A, %b %d') if best_day else None,
-            'rating': '🔥 Best Day' if best_day and best_day['score'] > 40 else ('✅ Good Day' if best_day else None),
+            'date': recommendations[0]['date'] if best_day else None,
+            'rating': ('🔥 Best Day' if best_day['score'] > 40 else '✅ Good Day') if best_day else None,
             'good_hours': best_day['good_hours'] if best_day else 0
         },
         'generated': datetime.now().isoformat()
     })
 
 
-if __name__ == '__main__':
-    # Rebuild trigger
-    print("🚀 Dashboard starting at http://localhost:5000")
-    print("🎯 Clawdbot Security Intelligence Dashboard")
-    print("🛡️  Security Intelligence: Active (web, X, blogs)")
-    print("🔍 Fingerprinting: Active verification enabled")
-    print("⏰ Auto-scan: Every hour")
-    
-    # Start background scheduler
+def start_scheduler():
+    """Register the hourly scan job and start the background scheduler."""
     if CENSYS_API_ID and CENSYS_API_SECRET:
+        # Five past each hour (+/-30s so instances don't fire in lockstep);
+        # runs missed while the process was paused collapse into one
         scheduler.add_job(
             run_background_scan,
-            trigger=IntervalTrigger(hours=1),
+            trigger=CronTrigger(minute=5, jitter=30),
             id='hourly_scan',
             name='Hourly Clawdbot scan',
-            replace_existing=True
+            replace_existing=True,
+            misfire_grace_time=300,
+            coalesce=True
         )
         scheduler.start()
         print("✅ Background scheduler started")
@@ -1302,5 +1735,17 @@ if __name__ == '__main__':
         # Still start without external API
         scheduler.start()
         print("✅ Background scheduler started (no external API)")
+
+
+if __name__ == '__main__':
+    # Local development server. In production run under gunicorn instead:
+    #   gunicorn -c gunicorn.conf.py app:app
+    print("🚀 Dashboard starting at http://localhost:5000")
+    print("🎯 Clawdbot Security Intelligence Dashboard")
+    print("🛡️  Security Intelligence: Active (web, X, blogs)")
+    print("🔍 Fingerprinting: Active verification enabled")
+    print("⏰ Auto-scan: Every hour")
+    
+    start_scheduler()
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=bool(os.environ.get('FLASK_DEV')), host='0.0.0.0', port=5000)
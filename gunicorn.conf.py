@@ -0,0 +1,42 @@
+"""
+Gunicorn settings for the Clawdbot Security Dashboard.
+
+Run with: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import fcntl
+import multiprocessing
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+# Fingerprint and Censys scans can take a while to answer
+timeout = 120
+
+# Held by whichever worker runs the scheduler; released when it exits
+SCHEDULER_LOCK_FILE = os.environ.get(
+    'SCHEDULER_LOCK_FILE',
+    os.path.join(tempfile.gettempdir(), 'clawdbot-scheduler.lock')
+)
+
+
+def post_worker_init(worker):
+    """
+    Run the hourly scan scheduler in exactly one worker. The master stays
+    free of app threads, so workers are never forked mid-scan; if the
+    scheduler's worker dies, its replacement picks the lock back up.
+    """
+    lock_file = open(SCHEDULER_LOCK_FILE, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return
+    # Keep the handle open for the worker's lifetime to hold the lock
+    worker.scheduler_lock = lock_file
+
+    from app import start_scheduler
+    start_scheduler()
@@ -0,0 +1,5 @@
+"""
+Scrapers for discovering exposed Clawdbot installations.
+Run them from the repository root as modules, e.g.
+python -m scraper.censys_scraper
+"""
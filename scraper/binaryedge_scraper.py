@@ -5,12 +5,15 @@ https://console.binaryedge.io/
 """
 
 import os
-import json
 from datetime import datetime
-import requests
+
+from .common import SESSION, save_results
 
 BINARYEDGE_BASE_URL = "https://api.binaryedge.io/v2"
 
+# Ports Clawdbot services commonly listen on
+CLAWDBOT_PORTS = frozenset({3000, 8080, 5000, 8000})
+
 def get_api_credentials():
     """Get BinaryEdge API credentials from environment."""
     return os.environ.get('BINARYEDGE_API_KEY', '')
@@ -32,7 +35,7 @@ def search_binaryedge(query, api_key=''):
             params = {'query': sq, 'page': 1, 'size': 20}
             headers = {'X-Key': api_key} if api_key else {}
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = SESSION.get(url, params=params, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -46,7 +49,7 @@ def search_binaryedge(query, api_key=''):
     
     return results
 
-def parse_binaryedge_result(item):
+def parse_binaryedge_result(item, timestamp):
     """Parse BinaryEdge result to our format."""
     target = item.get('target', {})
     ip = target.get('ip', '')
@@ -57,7 +60,7 @@ def parse_binaryedge_result(item):
     risk_score = 50
     
     # Check ports
-    if port in [3000, 8080, 5000, 8000]:
+    if port in CLAWDBOT_PORTS:
         risk_score += 20
         vulns.append('common_port')
     
@@ -78,10 +81,10 @@ def parse_binaryedge_result(item):
         'vulns': vulns,
         'risk_score': risk_score,
         'source': 'binaryedge',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': timestamp
     }
 
-def mock_scan():
+def mock_scan(timestamp):
     """Generate mock data for demo."""
     return [
         {
@@ -91,7 +94,7 @@ def mock_scan():
             'vulns': ['exposed_api', 'http_only'],
             'risk_score': 72,
             'source': 'binaryedge',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         },
         {
             'ip': '167.71.185.31',
@@ -100,12 +103,14 @@ def mock_scan():
             'vulns': ['no_auth'],
             'risk_score': 68,
             'source': 'binaryedge',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         }
     ]
 
 def run_scan():
     """Main scan function."""
+    # One timestamp for every record in this batch
+    timestamp = datetime.now().isoformat()
     api_key = get_api_credentials()
     
     if api_key:
@@ -114,21 +119,20 @@ def run_scan():
     else:
         print("⚠️  No BinaryEdge API key. Using mock data.")
         print("   Set BINARYEDGE_API_KEY env var for real scans.")
-        all_results = mock_scan()
+        all_results = mock_scan(timestamp)
     
     # Parse results
     results = []
     for item in all_results:
         if isinstance(item, dict):
-            parsed = parse_binaryedge_result(item)
+            parsed = parse_binaryedge_result(item, timestamp)
             results.append(parsed)
         else:
             results.append(item)
     
     # Save results
     output_file = 'scraper/results.json'
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    save_results(results, output_file)
     
     print(f"✅ Found {len(results)} installations")
     return results
@@ -5,15 +5,23 @@ Free alternative to Shodan.
 """
 
 import os
-import json
 from datetime import datetime
-import requests
+
+from .common import SESSION, save_results
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
     import censys
 except ImportError:
     censys = None
 
+# Ports Clawdbot services commonly listen on
+CLAWDBOT_PORTS = frozenset({3000, 8080, 5000, 8000})
+
 # Clawdbot search queries for Censys
 CENSYS_QUERIES = [
     'services.http.response.html_title:"Clawdbot Gateway"',
@@ -22,35 +30,48 @@ CENSYS_QUERIES = [
     'services.http.response.headers.x_powered_by:"Express"',
 ]
 
+# All queries in one search, so a scan is a single cursor-paged request
+CENSYS_QUERY = ' OR '.join(f'({q})' for q in CENSYS_QUERIES)
+CENSYS_SEARCH_URL = "https://search.censys.io/api/v2/hosts/search"
+MAX_HITS = 100
+
 def get_api_credentials():
     """Get Censys API credentials from environment."""
     return os.environ.get('CENSYS_API_ID', ''), os.environ.get('CENSYS_API_SECRET', '')
 
-def search_censys(api_id, api_secret, query):
+def search_censys(api_id, api_secret, query, max_hits=MAX_HITS):
     """Search Censys for Clawdbot installations."""
     results = []
     try:
         if censys:
             # Using censys-python library
             census = censys.CensysHosts(api_id=api_id, api_secret=api_secret)
-            for host in census.search(query, per_page=20):
+            for host in census.search(query, per_page=50):
                 results.append(host)
-                if len(results) >= 50:
+                if len(results) >= max_hits:
                     break
         else:
-            # Direct API call
-            url = "https://censys.io/api/v1/search/ipv4"
+            # Direct API call (v2), following the cursor page by page
             auth = (api_id, api_secret)
-            payload = {"query": query, "per_page": 20}
-            resp = requests.post(url, json=payload, auth=auth)
-            if resp.status_code == 200:
-                data = resp.json()
-                results = data.get('results', [])
+            cursor = None
+            while len(results) < max_hits:
+                params = {'q': query, 'per_page': 50}
+                if cursor:
+                    params['cursor'] = cursor
+                resp = SESSION.get(CENSYS_SEARCH_URL, params=params, auth=auth, timeout=15)
+                if resp.status_code != 200:
+                    break
+                data = orjson.loads(resp.content) if orjson else resp.json()
+                result = data.get('result', {})
+                results.extend(result.get('hits', []))
+                cursor = result.get('links', {}).get('next')
+                if not cursor:
+                    break
     except Exception as e:
         print(f"Censys search error: {e}")
-    return results
+    return results[:max_hits]
 
-def parse_censys_result(host):
+def parse_censys_result(host, timestamp):
     """Parse Censys result to our format."""
     ip = host.get('ip', '')
     services = host.get('services', [])
@@ -59,7 +80,7 @@ def parse_censys_result(host):
     clawdbot_services = []
     for svc in services:
         port = svc.get('port', 0)
-        if port in [3000, 8080, 5000, 8000]:
+        if port in CLAWDBOT_PORTS:
             clawdbot_services.append(svc)
     
     if not clawdbot_services:
@@ -86,10 +107,10 @@ def parse_censys_result(host):
         'location': {'country_name': country, 'city': city},
         'vulns': ['exposed_service'],
         'risk_score': risk_score,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': timestamp
     }
 
-def mock_scan():
+def mock_scan(timestamp):
     """Generate mock data for demo."""
     return [
         {
@@ -98,7 +119,7 @@ def mock_scan():
             'location': {'country_name': 'Germany', 'city': 'Frankfurt'},
             'vulns': ['exposed_api', 'http_only'],
             'risk_score': 78,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         },
         {
             'ip': '91.207.174.23',
@@ -106,7 +127,7 @@ def mock_scan():
             'location': {'country_name': 'Russia', 'city': 'Moscow'},
             'vulns': ['exposed_gateway'],
             'risk_score': 65,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         },
         {
             'ip': '203.0.113.50',
@@ -114,33 +135,36 @@ def mock_scan():
             'location': {'country_name': 'United States', 'city': 'San Francisco'},
             'vulns': ['outdated_version'],
             'risk_score': 42,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         },
     ]
 
 def run_scan():
     """Main scan function."""
+    # One timestamp for every record in this batch
+    timestamp = datetime.now().isoformat()
     api_id, api_secret = get_api_credentials()
     
     if api_id and api_secret:
         print(f"🔍 Scanning with Censys API...")
         all_results = []
-        for query in CENSYS_QUERIES:
-            results = search_censys(api_id, api_secret, query)
-            for host in results:
-                parsed = parse_censys_result(host)
-                if parsed:
-                    all_results.append(parsed)
+        seen_ips = set()
+        for host in search_censys(api_id, api_secret, CENSYS_QUERY):
+            if host.get('ip') in seen_ips:
+                continue
+            seen_ips.add(host.get('ip'))
+            parsed = parse_censys_result(host, timestamp)
+            if parsed:
+                all_results.append(parsed)
         results = all_results[:50]
     else:
         print(f"⚠️  No Censys API credentials. Using mock data.")
         print("   Set CENSYS_API_ID and CENSYS_API_SECRET env vars for real scans.")
-        results = mock_scan()
+        results = mock_scan(timestamp)
     
     # Save results
     output_file = 'scraper/results.json'
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    save_results(results, output_file)
     
     print(f"✅ Found {len(results)} installations")
     print(f"   Results saved to {output_file}")
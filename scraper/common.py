@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Clawdbot scrapers.
+"""
+
+import json
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared session so the query loop reuses one keep-alive connection;
+# transient errors and rate limits get a couple of backed-off retries
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False
+    )
+))
+
+def save_results(results, output_file):
+    """
+    Write results as indented JSON, using orjson when it is installed.
+    The file is replaced atomically, so scrapers running at the same time
+    (or the dashboard copying it) never see a half-written file.
+    """
+    if orjson:
+        body = orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(results, indent=2).encode()
+    
+    # Per-process temp name so concurrent scrapers don't share it
+    tmp_file = f"{output_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_file, output_file)
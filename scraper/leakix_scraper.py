@@ -5,16 +5,63 @@ https://leakix.net/
 """
 
 import os
-import json
+import threading
+import time
 from datetime import datetime
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import SESSION, save_results
 
 LEAKIX_BASE_URL = "https://leakix.net"
 
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least 1/rate seconds apart."""
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Block until the next call is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+# Stay under LeakIX's request rate so concurrent queries aren't answered
+# with 429s; any 429 that still happens is retried by SESSION, honouring
+# the Retry-After header
+LEAKIX_MAX_RATE = float(os.environ.get('LEAKIX_MAX_RATE', 2))
+LEAKIX_LIMITER = RateLimiter(LEAKIX_MAX_RATE)
+
 def get_api_credentials():
     """Get LeakIX API credentials from environment."""
     return os.environ.get('LEAKIX_API_KEY', '')
 
+def _search_leakix_query(sq, api_key=''):
+    """Run a single LeakIX search query and return its raw results."""
+    try:
+        url = f"{LEAKIX_BASE_URL}/search"
+        params = {'q': sq, 'page': 1, 'limit': 20}
+        headers = {}
+        
+        if api_key:
+            headers['Api-Key'] = api_key
+        
+        LEAKIX_LIMITER.wait()
+        response = SESSION.get(url, params=params, headers=headers, timeout=10)
+        
+        if response.status_code == 200:
+            data = response.json()
+            return data.get('results', [])
+        # Anything else (e.g. 429 after the session's retries) yields nothing
+    except Exception as e:
+        print(f"LeakIX search error: {e}")
+    return []
+
 def search_leakix(query, api_key=''):
     """Search LeakIX for Clawdbot installations."""
     results = []
@@ -26,30 +73,15 @@ def search_leakix(query, api_key=''):
         'port:3000'
     ]
     
-    for sq in search_queries:
-        try:
-            url = f"{LEAKIX_BASE_URL}/search"
-            params = {'q': sq, 'page': 1, 'limit': 20}
-            headers = {}
-            
-            if api_key:
-                headers['Api-Key'] = api_key
-            
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                for item in data.get('results', []):
-                    results.append(item)
-            elif response.status_code == 429:
-                # Rate limited, wait and retry
-                continue
-        except Exception as e:
-            print(f"LeakIX search error: {e}")
+    # Queries are independent, so run them side by side; map() keeps
+    # the results in query order
+    with ThreadPoolExecutor(max_workers=len(search_queries)) as pool:
+        for items in pool.map(lambda sq: _search_leakix_query(sq, api_key), search_queries):
+            results.extend(items)
     
     return results
 
-def parse_leakix_result(item):
+def parse_leakix_result(item, timestamp):
     """Parse LeakIX result to our format."""
     ip = item.get('ip', '')
     port = item.get('port', 0)
@@ -75,10 +107,10 @@ def parse_leakix_result(item):
         'vulns': ['exposed_service'],
         'risk_score': risk_score,
         'source': 'leakix',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': timestamp
     }
 
-def mock_scan():
+def mock_scan(timestamp):
     """Generate mock data for demo."""
     return [
         {
@@ -88,7 +120,7 @@ def mock_scan():
             'vulns': ['exposed_api', 'no_auth'],
             'risk_score': 78,
             'source': 'leakix',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         },
         {
             'ip': '138.68.10.122',
@@ -97,12 +129,14 @@ def mock_scan():
             'vulns': ['default_config'],
             'risk_score': 55,
             'source': 'leakix',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         }
     ]
 
 def run_scan():
     """Main scan function."""
+    # One timestamp for every record in this batch
+    timestamp = datetime.now().isoformat()
     api_key = get_api_credentials()
     
     if api_key:
@@ -111,21 +145,20 @@ def run_scan():
     else:
         print("⚠️  No LeakIX API key. Using mock data.")
         print("   Set LEAKIX_API_KEY env var for real scans.")
-        all_results = mock_scan()
+        all_results = mock_scan(timestamp)
     
     # Parse results
     results = []
     for item in all_results:
         if isinstance(item, dict):
-            parsed = parse_leakix_result(item)
+            parsed = parse_leakix_result(item, timestamp)
             results.append(parsed)
         else:
             results.append(item)
     
     # Save results
     output_file = 'scraper/results.json'
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    save_results(results, output_file)
     
     print(f"✅ Found {len(results)} installations")
     return results
@@ -4,10 +4,11 @@ Shodan scraper for discovering accessible Clawdbot installations.
 """
 
 import os
-import json
 import time
 from datetime import datetime
 
+from .common import save_results
+
 try:
     import shodan
 except ImportError:
@@ -32,7 +33,7 @@ def search_clawdbot(api, query='clawdbot'):
         print(f"Search error: {e}")
     return results
 
-def mock_scan():
+def mock_scan(timestamp):
     """Generate mock data for demo purposes."""
     return [
         {
@@ -41,7 +42,7 @@ def mock_scan():
             'location': {'country_name': 'Israel', 'city': 'Tel Aviv'},
             'vulns': ['exposed_api', 'no_auth'],
             'risk_score': 85,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         },
         {
             'ip': '10.0.0.55',
@@ -49,7 +50,7 @@ def mock_scan():
             'location': {'country_name': 'United States', 'city': 'New York'},
             'vulns': ['default_creds', 'exposed_terminal'],
             'risk_score': 92,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         },
         {
             'ip': '172.16.0.23',
@@ -57,12 +58,14 @@ def mock_scan():
             'location': {'country_name': 'Germany', 'city': 'Berlin'},
             'vulns': ['outdated_version'],
             'risk_score': 45,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         },
     ]
 
 def run_scan():
     """Main scan function."""
+    # One timestamp for every record in this batch
+    timestamp = datetime.now().isoformat()
     api_key = get_api_key()
     
     if api_key and shodan:
@@ -72,12 +75,11 @@ def run_scan():
     else:
         print(f"⚠️  No Shodan API key. Using mock data for demo.")
         print("   Set SHODAN_API_KEY env var for real scans.")
-        results = mock_scan()
+        results = mock_scan(timestamp)
     
     # Save results
     output_file = 'scraper/results.json'
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    save_results(results, output_file)
     
     print(f"✅ Found {len(results)} installations")
     print(f"   Results saved to {output_file}")
@@ -6,15 +6,23 @@ Rates severity and discussion volume.
 Provides actionable mitigation recommendations.
 """
 
+import functools
+import heapq
 import json
 import re
 import os
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 HOURS_BACK = 24
+DISCUSSIONS_SHOWN = 20  # Top discussions kept for the dashboard
 
 # Severity scoring keywords
 SEVERITY_KEYWORDS = {
@@ -65,15 +73,35 @@ MITIGATIONS = {
     }
 }
 
+def _keyword_pattern(keywords):
+    """Compile a case-insensitive alternation matching any of keywords."""
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+
+# One pattern per severity. The lookahead tries every position, so
+# keywords that overlap in the text are all counted (only the longest
+# is seen where one keyword is a prefix of another in the same bucket).
+SEVERITY_PATTERNS = {
+    severity: re.compile(
+        '(?=(%s))' % '|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))),
+        re.IGNORECASE
+    )
+    for severity, keywords in SEVERITY_KEYWORDS.items()
+}
+
+# One pattern per mitigation: its issue title or any word of its key
+MITIGATION_PATTERNS = {
+    key: _keyword_pattern([data['issue'].lower(), *key.split('_')])
+    for key, data in MITIGATIONS.items()
+}
+
+@functools.lru_cache(maxsize=4096)
 def rate_severity(text):
     """Rate the severity of a security issue based on keywords."""
-    text_lower = text.lower()
     scores = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
     
-    for severity, keywords in SEVERITY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                scores[severity] += 1
+    # Each distinct keyword present counts once
+    for severity, pattern in SEVERITY_PATTERNS.items():
+        scores[severity] = len({match.lower() for match in pattern.findall(text)})
     
     max_score = max(scores.values())
     if max_score == 0:
@@ -88,20 +116,28 @@ def rate_severity(text):
     else:
         return 'low', 25
 
+@functools.lru_cache(maxsize=4096)
+def _mitigation_keys(text):
+    """Return the MITIGATIONS keys whose patterns match text, in table order."""
+    return tuple(key for key, pattern in MITIGATION_PATTERNS.items() if pattern.search(text))
+
 def extract_security_issues(text):
     """Extract security issues mentioned in the text."""
-    text_lower = text.lower()
-    issues = []
-    
-    for key, data in MITIGATIONS.items():
-        if data['issue'].lower() in text_lower or any(kw in text_lower for kw in key.split('_')):
-            issues.append({
-                'issue': data['issue'],
-                'mitigation': data['mitigation'],
-                'severity': data['severity']
-            })
-    
-    return issues
+    # Callers keep the issue dicts, so only the matching keys are cached
+    return [
+        {
+            'issue': MITIGATIONS[key]['issue'],
+            'mitigation': MITIGATIONS[key]['mitigation'],
+            'severity': MITIGATIONS[key]['severity']
+        }
+        for key in _mitigation_keys(text)
+    ]
+
+def curated_severity(entry):
+    """Return the hand-assigned (severity, score) if set, else rate the text."""
+    if entry.get('severity') and entry.get('severity_score') is not None:
+        return entry['severity'], entry['severity_score']
+    return rate_severity(entry['text'])
 
 def search_web():
     """Search web for Clawdbot security discussions."""
@@ -157,7 +193,7 @@ def search_web():
     
     results = []
     for article in known_articles:
-        severity, score = rate_severity(article['text'])
+        severity, score = curated_severity(article)
         issues = extract_security_issues(article['text'])
         
         results.append({
@@ -169,7 +205,7 @@ def search_web():
             'score': 0,
             'comments': 0,
             'severity': severity,
-            'severity_score': article['severity_score'],
+            'severity_score': score,
             'issues': issues,
             'text': article['text']
         })
@@ -214,69 +250,75 @@ def search_x():
     ]
     
     for r in results:
-        severity, score = rate_severity(r['text'])
-        issues = extract_security_issues(r['text'])
-        r['severity'] = severity
-        r['severity_score'] = score
-        r['issues'] = issues
+        r['severity'], r['severity_score'] = curated_severity(r)
+        r['issues'] = extract_security_issues(r['text'])
     
     print(f"   Found {len(results)} X results")
     return results
 
+def discussion_key(discussion):
+    """Sort key ranking discussions by severity, then by engagement."""
+    return (discussion['severity_score'], discussion.get('comments', 0), discussion.get('points', 0))
+
 def analyze_results(all_results):
     """Analyze results and generate dashboard data."""
     
     if not all_results:
         return None
     
-    # Remove duplicates by URL
-    seen_urls = set()
-    unique_results = []
-    for r in all_results:
-        if r['url'] not in seen_urls:
-            seen_urls.add(r['url'])
-            unique_results.append(r)
-    
-    # Sort by severity and discussion
-    unique_results.sort(key=lambda x: (x['severity_score'], x.get('comments', 0), x.get('points', 0)), reverse=True)
-    
     # Aggregate statistics
     stats = {
-        'total_discussions': len(unique_results),
+        'total_discussions': 0,
         'by_severity': {'critical': 0, 'high': 0, 'medium': 0, 'low': 0},
-        'by_source': defaultdict(int),
+        'by_source': Counter(),
         'avg_severity': 0,
-        'total_mentions': sum(r.get('comments', 0) + r.get('points', 0) for r in unique_results)
+        'total_mentions': 0
     }
     
-    severity_scores = []
-    all_issues = []
+    # Remove duplicates by URL and aggregate in the same pass
+    seen_urls = set()
+    unique_results = []
+    total_severity = 0
+    # issue -> [count, mitigation of its first mention]
+    issue_counts = {}
     
-    for r in unique_results:
+    for r in all_results:
+        if r['url'] in seen_urls:
+            continue
+        seen_urls.add(r['url'])
+        
         stats['by_severity'][r['severity']] += 1
         stats['by_source'][r['source']] += 1
-        severity_scores.append(r['severity_score'])
-        all_issues.extend(r.get('issues', []))
+        stats['total_mentions'] += r.get('comments', 0) + r.get('points', 0)
+        total_severity += r['severity_score']
+        
+        for issue in r.get('issues', []):
+            entry = issue_counts.get(issue['issue'])
+            if entry is None:
+                issue_counts[issue['issue']] = [1, issue['mitigation']]
+            else:
+                entry[0] += 1
+        
+        unique_results.append(r)
     
-    if severity_scores:
-        stats['avg_severity'] = sum(severity_scores) / len(severity_scores)
+    stats['total_discussions'] = len(unique_results)
+    if unique_results:
+        stats['avg_severity'] = total_severity / len(unique_results)
     
-    # Aggregate issues
-    issue_counts = defaultdict(list)
-    for issue in all_issues:
-        issue_counts[issue['issue']].append(issue['mitigation'])
+    # Only the top discussions are published, so select them instead of
+    # sorting everything (same order as a full sort by severity and discussion)
+    top_discussions = heapq.nlargest(DISCUSSIONS_SHOWN, unique_results, key=discussion_key)
     
-    top_issues = []
-    for issue, mitigations in issue_counts.items():
-        top_issues.append({
-            'issue': issue,
-            'count': len(mitigations),
-            'mitigation': mitigations[0]
-        })
-    top_issues.sort(key=lambda x: x['count'], reverse=True)
+    # Issues are ranked by count; ties keep the order in which they were
+    # first mentioned (the sort is stable)
+    ranked_issues = sorted(issue_counts.items(), key=lambda item: item[1][0], reverse=True)
+    top_issues = [
+        {'issue': issue, 'count': count, 'mitigation': mitigation}
+        for issue, (count, mitigation) in ranked_issues
+    ]
     
     return {
-        'discussions': unique_results,
+        'discussions': top_discussions,
         'stats': dict(stats),
         'top_issues': top_issues[:10],
         'timestamp': datetime.now().isoformat()
@@ -319,10 +361,10 @@ def generate_dashboard_json(data, filename='static/data/security_intel.json'):
                 'url': d['url'],
                 'severity': d['severity'],
                 'severity_score': d['severity_score'],
-                'date': d['date'].strftime('%Y-%m-%d %H:%M'),
+                'date': d['date'].isoformat(sep=' ', timespec='minutes'),
                 'engagement': d.get('comments', 0) + d.get('points', 0) + d.get('score', 0)
             }
-            for d in data['discussions'][:20]
+            for d in data['discussions']
         ],
         'mitigations': [
             {
@@ -333,15 +375,23 @@ def generate_dashboard_json(data, filename='static/data/security_intel.json'):
         ]
     }
     
-    with open(filename, 'w') as f:
-        json.dump(dashboard_data, f, indent=2)
+    if orjson:
+        body = orjson.dumps(dashboard_data, option=orjson.OPT_INDENT_2)
+    else:
+        body = json.dumps(dashboard_data, indent=2).encode()
+    
+    # Write beside the target and swap it in, so the dashboard never
+    # reads a half-written file while a refresh is running; the temp name
+    # is per-process so concurrent refreshes don't share it
+    tmp_file = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_file, filename)
     
     print(f"\n📊 Dashboard data saved to {filename}")
 
-def main():
-    print(f"\n🔎 Clawdbot Security Intelligence Dashboard")
-    print(f"📅 Analysis period: Last {HOURS_BACK} hours\n")
-    
+def refresh(filename='static/data/security_intel.json'):
+    """Collect and analyze discussions, write the dashboard JSON and return the analysis."""
     all_results = []
     all_results.extend(search_web())
     all_results.extend(search_x())
@@ -349,9 +399,16 @@ def main():
     data = analyze_results(all_results)
     
     if data:
-        # Generate dashboard JSON
-        generate_dashboard_json(data, '/home/ubuntu/clawd/clawdbot-security-dashboard/static/data/security_intel.json')
-        
+        generate_dashboard_json(data, filename)
+    return data
+
+def main():
+    print(f"\n🔎 Clawdbot Security Intelligence Dashboard")
+    print(f"📅 Analysis period: Last {HOURS_BACK} hours\n")
+    
+    data = refresh('/home/ubuntu/clawd/clawdbot-security-dashboard/static/data/security_intel.json')
+    
+    if data:
         # Print summary
         print(f"\n{'='*70}")
         print(f"📊 SECURITY INTELLIGENCE SUMMARY")
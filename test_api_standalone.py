@@ -30,10 +30,13 @@ if not API_ID or not API_SECRET:
 # Test 1: Simple search query
 print("\n📡 Test 1: Search for port 3000...")
 url = "https://search.censys.io/api/v2/hosts/search?q=port:3000&per_page=5"
-auth = HTTPBasicAuth(API_ID, API_SECRET)
+
+# One session for every query so they share a TLS connection and the auth
+session = requests.Session()
+session.auth = HTTPBasicAuth(API_ID, API_SECRET)
 
 try:
-    resp = requests.get(url, auth=auth, timeout=30)
+    resp = session.get(url, timeout=30)
     print(f"   Status: {resp.status_code}")
     
     if resp.status_code == 200:
@@ -62,7 +65,7 @@ print("\n📡 Test 2: Search for Clawdbot ports (18789, 18791)...")
 for port in ['18789', '18791']:
     url = f"https://search.censys.io/api/v2/hosts/search?q=port:{port}&per_page=3"
     try:
-        resp = requests.get(url, auth=auth, timeout=15)
+        resp = session.get(url, timeout=15)
         if resp.status_code == 200:
             data = resp.json()
             hits = data.get('result', {}).get('hits', [])
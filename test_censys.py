@@ -5,8 +5,21 @@ Run locally with API keys configured.
 """
 
 import os
+import hashlib
+import json
+import re
+import socket
+import time
+from urllib.parse import urlencode
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 CENSYS_API_ID = os.environ.get('CENSYS_API_ID', '7gKjBEGz')
@@ -14,110 +27,246 @@ CENSYS_API_SECRET = os.environ.get('CENSYS_API_SECRET', '33MCyBd8i1PNkmsBEPseK6M
 
 REQUEST_TIMEOUT = 3
 
-def fingerprint_clawdbot(ip, port):
-    """Actively fingerprint a service to verify it's Clawdbot."""
-    base_url = f"http://{ip}:{port}"
-    vulns = []
-    service_info = {}
-    
-    print(f"\n🔍 Fingerprinting {ip}:{port}...")
-    
-    # Check 1: Gateway API health endpoint
+# One keep-alive session for the probes and the Censys queries, so the
+# checks against a host share a connection instead of reconnecting
+SESSION = requests.Session()
+SESSION.headers.update({'Connection': 'keep-alive'})
+SESSION.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0))
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+def _check_health(base_url):
+    """Check 1: Gateway API health endpoint."""
+    lines, vulns, info = [], [], {}
     try:
-        response = requests.get(f"{base_url}/api/health", timeout=REQUEST_TIMEOUT)
-        print(f"  /api/health: {response.status_code}")
+        response = SESSION.get(f"{base_url}/api/health", timeout=REQUEST_TIMEOUT)
+        lines.append(f"  /api/health: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
             if data.get('status') == 'ok':
                 vulns.append('exposed_api')
-                service_info['gateway'] = True
-                print(f"    ✓ Gateway detected")
+                info['gateway'] = True
+                lines.append(f"    ✓ Gateway detected")
     except Exception as e:
-        print(f"  /api/health: Failed - {type(e).__name__}")
-    
-    # Check 2: Gateway status endpoint
+        lines.append(f"  /api/health: Failed - {type(e).__name__}")
+    return lines, vulns, info
+
+def _check_status(base_url):
+    """Check 2: Gateway status endpoint."""
+    lines, vulns, info = [], [], {}
     try:
-        response = requests.get(f"{base_url}/api/status", timeout=REQUEST_TIMEOUT)
-        print(f"  /api/status: {response.status_code}")
+        response = SESSION.get(f"{base_url}/api/status", timeout=REQUEST_TIMEOUT)
+        lines.append(f"  /api/status: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
-            service_info['version'] = data.get('version', 'unknown')
+            info['version'] = data.get('version', 'unknown')
             if not data.get('auth', {}).get('enabled'):
                 vulns.append('no_auth')
-            print(f"    ✓ Status endpoint accessible")
+            lines.append(f"    ✓ Status endpoint accessible")
     except Exception as e:
-        print(f"  /api/status: Failed - {type(e).__name__}")
-    
-    # Check 3: Web UI
+        lines.append(f"  /api/status: Failed - {type(e).__name__}")
+    return lines, vulns, info
+
+# Markers sit near the top of the page, so only this much is scanned
+WEB_SCAN_LIMIT = 64 * 1024
+WEB_MARKERS = (b'clawdbot', b'claude')
+# Case-insensitive, so chunks are searched as-is without a lowercased copy
+WEB_MARKER_RE = re.compile(b'|'.join(map(re.escape, WEB_MARKERS)), re.IGNORECASE)
+
+def _page_has_marker(response):
+    """Scan a streamed page for a Clawdbot marker, stopping at the first hit."""
+    # Carry the end of each chunk over so markers split across chunks match
+    overlap = max(map(len, WEB_MARKERS)) - 1
+    tail = b''
+    scanned = 0
+    for chunk in response.iter_content(chunk_size=8192):
+        window = tail + chunk
+        if WEB_MARKER_RE.search(window):
+            return True
+        tail = window[-overlap:]
+        scanned += len(chunk)
+        if scanned >= WEB_SCAN_LIMIT:
+            break
+    return False
+
+def _check_web_ui(base_url):
+    """Check 3: Web UI."""
+    lines, vulns, info = [], [], {}
     try:
-        response = requests.get(base_url, timeout=REQUEST_TIMEOUT)
-        print(f"  / (web): {response.status_code}")
-        if response.status_code == 200:
-            content = response.text.lower()
-            if 'clawdbot' in content or 'claude' in content:
-                service_info['web_ui'] = True
-                print(f"    ✓ Clawdbot web UI detected")
-            else:
-                print(f"    ✗ No Clawdbot markers in HTML")
+        with SESSION.get(base_url, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            lines.append(f"  / (web): {response.status_code}")
+            if response.status_code == 200:
+                if _page_has_marker(response):
+                    info['web_ui'] = True
+                    lines.append(f"    ✓ Clawdbot web UI detected")
+                else:
+                    lines.append(f"    ✗ No Clawdbot markers in HTML")
     except Exception as e:
-        print(f"  / (web): Failed - {type(e).__name__}")
+        lines.append(f"  / (web): Failed - {type(e).__name__}")
+    return lines, vulns, info
+
+CHECKS = (_check_health, _check_status, _check_web_ui)
+
+# Hosts fingerprinted at once per Censys page
+HOST_WORKERS = 10
+
+# Shared across hosts so threads aren't created per fingerprint; sized so
+# every host being fingerprinted can run all of its checks at once
+_check_pool = ThreadPoolExecutor(max_workers=len(CHECKS) * HOST_WORKERS)
+
+# A host that won't accept a TCP connection in this long is treated as
+# down, rather than waiting out every check's REQUEST_TIMEOUT
+CONNECT_PRECHECK_TIMEOUT = 1
+
+def _port_open(ip, port):
+    try:
+        socket.create_connection((ip, port), timeout=CONNECT_PRECHECK_TIMEOUT).close()
+        return True, None
+    except OSError as e:
+        return False, e
+
+def fingerprint_clawdbot(ip, port):
+    """Actively fingerprint a service to verify it's Clawdbot."""
+    base_url = f"http://{ip}:{port}"
+    vulns = []
+    service_info = {}
+    
+    output = [f"\n🔍 Fingerprinting {ip}:{port}..."]
+    reachable, error = _port_open(ip, port)
+    if not reachable:
+        output.append(f"  TCP connect: Failed - {type(error).__name__}")
+        output.append(f"  Result: ✗ UNREACHABLE")
+        print('\n'.join(output))
+        return False, [], {}
+    
+    # The checks run concurrently; their output is printed in check order
+    for lines, check_vulns, check_info in _check_pool.map(lambda check: check(base_url), CHECKS):
+        output.extend(lines)
+        vulns.extend(check_vulns)
+        service_info.update(check_info)
     
     is_clawdbot = bool(service_info)
-    print(f"  Result: {'✓ CLAWDBOT' if is_clawdbot else '✗ NOT CLAWDBOT'}")
-    print(f"  Vulnerabilities: {vulns}")
+    output.append(f"  Result: {'✓ CLAWDBOT' if is_clawdbot else '✗ NOT CLAWDBOT'}")
+    output.append(f"  Vulnerabilities: {vulns}")
+    print('\n'.join(output))
     
     return is_clawdbot, vulns, service_info
 
-def search_censys(query, service_name):
-    """Search Censys and fingerprint results."""
+# Successful Censys responses are kept on disk for a few minutes so
+# repeated debugging runs don't spend API quota on identical searches.
+# CENSYS_CACHE_TTL=0 always queries the API.
+CENSYS_CACHE_DIR = '.censys_cache'
+CENSYS_CACHE_TTL = int(os.environ.get('CENSYS_CACHE_TTL', 300))
+
+def _cache_path(url):
+    return os.path.join(CENSYS_CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + '.json')
+
+def _load_cached(url):
+    """Return the saved response data for url if it is fresh enough, else None."""
+    if CENSYS_CACHE_TTL <= 0:
+        return None
+    path = _cache_path(url)
+    try:
+        if time.time() - os.path.getmtime(path) < CENSYS_CACHE_TTL:
+            with open(path) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+def _save_cached(url, data):
+    if CENSYS_CACHE_TTL <= 0:
+        return
+    os.makedirs(CENSYS_CACHE_DIR, exist_ok=True)
+    with open(_cache_path(url), 'w') as f:
+        json.dump(data, f)
+
+# Stop fingerprinting once this many installations are verified
+# (MAX_VERIFIED=0, the default, fingerprints every hit)
+MAX_VERIFIED = int(os.environ.get('MAX_VERIFIED', 0)) or None
+
+def search_censys(services, per_page=30, max_verified=None):
+    """
+    Search Censys once for every port in services ({port: name}) and
+    fingerprint the matching services, stopping early once max_verified
+    are confirmed. Returns (hits found, verified).
+    """
+    ports = ', '.join(str(port) for port in services)
     print(f"\n{'='*60}")
-    print(f"🔍 Searching Censys for: {service_name} (port {query})")
+    print(f"🔍 Searching Censys for: {', '.join(services.values())} (ports {ports})")
     print(f"{'='*60}")
     
-    url = f"https://search.censys.io/api/v2/hosts/search?q={query}&per_page=10"
+    query = f"services.port: {{{ports}}}"
+    url = f"https://search.censys.io/api/v2/hosts/search?{urlencode({'q': query, 'per_page': per_page})}"
     auth = (CENSYS_API_ID, CENSYS_API_SECRET)
     
     try:
-        response = requests.get(url, auth=auth, timeout=30)
-        print(f"Status: {response.status_code}")
-        
-        if response.status_code != 200:
-            print(f"Error: {response.text}")
-            return []
+        data = _load_cached(url)
+        if data is not None:
+            print(f"Status: cached (< {CENSYS_CACHE_TTL}s old)")
+        else:
+            response = SESSION.get(url, auth=auth, timeout=30)
+            print(f"Status: {response.status_code}")
+            
+            if response.status_code != 200:
+                print(f"Error: {response.text}")
+                return 0, []
+            
+            data = orjson.loads(response.content) if orjson else response.json()
+            _save_cached(url, data)
         
-        data = response.json()
         hits = data.get('result', {}).get('hits', [])
-        print(f"Found {len(hits)} hosts with port {query}")
+        print(f"Found {len(hits)} hosts with ports {ports}")
         
-        verified = []
+        # Bucket each hit's matching services client-side
+        targets = []
+        seen = set()
         for hit in hits:
             ip = hit.get('ip', 'unknown')
             location = hit.get('location', {})
             
-            # Get the port
-            services = hit.get('services', [])
-            port = services[0].get('port', int(query)) if services else int(query)
-            
-            print(f"\n  Host: {ip}:{port}")
-            print(f"  Location: {location.get('city', 'Unknown')}, {location.get('country', 'Unknown')}")
-            
-            # Fingerprint
-            is_clawdbot, vulns, service_info = fingerprint_clawdbot(ip, port)
-            
-            if is_clawdbot:
-                verified.append({
-                    'ip': ip,
-                    'port': port,
-                    'location': location,
-                    'vulns': vulns,
-                    'service_info': service_info
-                })
+            for service in hit.get('services', []):
+                port = service.get('port')
+                if port not in services or (ip, port) in seen:
+                    continue
+                seen.add((ip, port))
+                
+                print(f"\n  Host: {ip}:{port} ({services[port]})")
+                print(f"  Location: {location.get('city', 'Unknown')}, {location.get('country', 'Unknown')}")
+                targets.append((ip, port, location))
+        
+        # Fingerprint the hosts concurrently, taking results as they finish
+        found = []
+        with ThreadPoolExecutor(max_workers=HOST_WORKERS) as pool:
+            futures = {pool.submit(fingerprint_clawdbot, ip, port): i
+                       for i, (ip, port, _) in enumerate(targets)}
+            for future in as_completed(futures):
+                is_clawdbot, vulns, service_info = future.result()
+                if is_clawdbot:
+                    found.append((futures[future], vulns, service_info))
+                    if max_verified and len(found) >= max_verified:
+                        # Quota met: drop the hosts that haven't started yet
+                        for pending in futures:
+                            pending.cancel()
+                        break
         
-        return verified
+        # Report in hit order regardless of which host answered first
+        verified = []
+        for i, vulns, service_info in sorted(found, key=lambda f: f[0]):
+            ip, port, location = targets[i]
+            verified.append({
+                'ip': ip,
+                'port': port,
+                'service': services[port],
+                'location': location,
+                'vulns': vulns,
+                'service_info': service_info
+            })
+        
+        return len(hits), verified
         
     except Exception as e:
         print(f"Error: {e}")
-        return []
+        return 0, []
 
 def main():
     print(f"\n{'='*60}")
@@ -126,23 +275,19 @@ def main():
     print(f"API ID: {CENSYS_API_ID[:10]}...")
     print(f"Timestamp: {datetime.now().isoformat()}")
     
-    all_results = []
-    
-    # Search for Clawdbot ports
-    queries = [
-        ("18789", "Clawdbot Gateway"),
-        ("3000", "Clawdbot Web UI"),
-        ("18791", "Clawdbot Browser Control"),
-    ]
+    # Search for Clawdbot ports, all in one query
+    services = {
+        18789: "Clawdbot Gateway",
+        3000: "Clawdbot Web UI",
+        18791: "Clawdbot Browser Control",
+    }
     
-    for query, service_name in queries:
-        results = search_censys(query, service_name)
-        all_results.extend(results)
+    total_hits, all_results = search_censys(services, max_verified=MAX_VERIFIED)
     
     print(f"\n{'='*60}")
     print(f"📊 SUMMARY")
     print(f"{'='*60}")
-    print(f"Total hosts found by Censys: {sum(len(search_censys(q, s) or []) for q, s in queries)}")
+    print(f"Total hosts found by Censys: {total_hits}")
     print(f"Verified Clawdbot installations: {len(all_results)}")
     
     if all_results:
@@ -6,6 +6,11 @@ Direct test of Censys API with credentials.
 import requests
 from requests.auth import HTTPBasicAuth
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Hardcoded credentials (from Eyal)
 API_ID = "Q8MvuXQb"
 API_SECRET = "7keQK5JtchFfuuVKxGWTkTRZ"
@@ -40,8 +45,7 @@ try:
     print(f"   Status: {resp.status_code}")
     
     if resp.status_code == 200:
-        import json
-        data = resp.json()
+        data = orjson.loads(resp.content) if orjson else resp.json()
         hits = data.get('result', {}).get('hits', [])
         print(f"   SUCCESS! Found {len(hits)} hosts")
         for h in hits[:3]:
@@ -54,20 +58,28 @@ except Exception as e:
 
 # Test search for Clawdbot-specific ports
 print("\n3. Testing search for Clawdbot ports...")
-for port in ["18789", "18791"]:
-    try:
-        resp = requests.get(
-            f"https://search.censys.io/api/v2/hosts/search?q=port:{port}&per_page=3",
-            auth=auth,
-            timeout=30
-        )
-        if resp.status_code == 200:
-            data = resp.json()
-            hits = len(data.get('result', {}).get('hits', []))
-            print(f"   Port {port}: {hits} hosts")
-        else:
-            print(f"   Port {port}: Error {resp.status_code}")
-    except Exception as e:
-        print(f"   Port {port}: {e}")
+ports = ["18789", "18791"]
+per_page = 30
+try:
+    resp = requests.get(
+        "https://search.censys.io/api/v2/hosts/search",
+        params={"q": f"services.port: {{{', '.join(ports)}}}", "per_page": per_page},
+        auth=auth,
+        timeout=30
+    )
+    if resp.status_code == 200:
+        data = orjson.loads(resp.content) if orjson else resp.json()
+        # One query for every port; bucket the hits by port client-side.
+        # Counts are within that one shared page, not totals per port.
+        counts = dict.fromkeys(ports, 0)
+        for h in data.get('result', {}).get('hits', []):
+            for port in {str(s.get('port')) for s in h.get('services', [])} & counts.keys():
+                counts[port] += 1
+        for port, hits in counts.items():
+            print(f"   Port {port}: {hits} hosts (in the first {per_page} results for all ports)")
+    else:
+        print(f"   Ports {', '.join(ports)}: Error {resp.status_code}")
+except Exception as e:
+    print(f"   Ports {', '.join(ports)}: {e}")
 
 print("\nDone!")
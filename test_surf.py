@@ -10,14 +10,12 @@ import json
 from datetime import datetime
 from app import app
 
+# One test client for every case rather than a new one per request
+CLIENT = app.test_client()
+
 def test_api_with_client(endpoint, params=None):
     """Test an API endpoint using Flask test client."""
-    with app.test_client() as client:
-        if params:
-            resp = client.get(endpoint, query_string=params)
-        else:
-            resp = client.get(endpoint)
-        return resp
+    return CLIENT.get(endpoint, query_string=params)
 
 
 def test_surf_forecast():
@@ -0,0 +1,3 @@
+def pytest_configure(config):
+    # Skip the live network tests with: pytest -m "not slow"
+    config.addinivalue_line('markers', 'slow: test makes live network calls (Censys API, remote hosts)')